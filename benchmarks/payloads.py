@@ -0,0 +1,100 @@
+"""
+Polymorphic payloads for the benchmarks, built on the shapes used by the tests
+"""
+import os
+
+from marshmallow import fields
+
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+)
+
+#: List sizes to run. Set POLYFIELD_BENCH_SIZES="1,100,10000,1000000" for the full range
+SIZES = [int(size) for size in os.environ.get('POLYFIELD_BENCH_SIZES', '1,100,10000').split(',')]
+
+#: Number of distinct polymorphic types in a payload
+CARDINALITIES = [2, 20, 200]
+
+
+class ShapeTypes(object):
+    """
+    cardinality distinct shape types, each with its own model class and
+    schema class. Types alternate between rectangles and triangles and carry
+    their name in a "kind" key so selectors can dispatch on it
+    """
+    def __init__(self, cardinality):
+        self.names = []
+        self.models = {}
+        self.schemas = {}
+        for i in range(cardinality):
+            base_model, base_schema = (Rectangle, RectangleSchema) if i % 2 == 0 else (
+                Triangle, TriangleSchema
+            )
+            name = '{0}{1}'.format(base_model.__name__, i)
+            model = type(name, (base_model,), {})
+            self.names.append(name)
+            self.models[name] = model
+            self.schemas[name] = type(name + 'Schema', (base_schema,), {'kind': fields.Str()})
+        self.model_schemas = {self.models[name]: self.schemas[name] for name in self.names}
+
+    def class_selector(self, value, _):
+        return self.schemas[value['kind']]
+
+    def instance_selector(self, value, _):
+        return self.schemas[value['kind']]()
+
+    def serialization_class_selector(self, value, _):
+        return self.model_schemas[type(value)]
+
+    def serialization_instance_selector(self, value, _):
+        return self.model_schemas[type(value)]()
+
+    def raw_values(self, size):
+        values = []
+        for i in range(size):
+            name = self.names[i % len(self.names)]
+            if issubclass(self.models[name], Rectangle):
+                values.append({'kind': name, 'color': 'blue', 'length': i, 'width': 2})
+            else:
+                values.append({'kind': name, 'color': 'red', 'base': i, 'height': 2})
+        return values
+
+    def objects(self, size):
+        objects = []
+        for i in range(size):
+            model = self.models[self.names[i % len(self.names)]]
+            if issubclass(model, Rectangle):
+                objects.append(model('blue', i, 2))
+            else:
+                objects.append(model('red', i, 2))
+        return objects
+
+
+def field_selector(value, _):
+    return fields.Email if isinstance(value, str) else fields.Int
+
+
+def field_values(size):
+    return ['user{0}@example.com'.format(i) if i % 2 else i for i in range(size)]
+
+
+def untagged_values(size):
+    return [
+        {'color': 'blue', 'length': i, 'width': 2} if i % 2 else
+        {'color': 'red', 'base': i, 'height': 2}
+        for i in range(size)
+    ]
+
+
+_UNTAGGED_SCHEMAS = (TriangleSchema(), RectangleSchema())
+
+
+def trial_selector(value, _):
+    """Hand written selector trying each schema until one validates"""
+    for schema in _UNTAGGED_SCHEMAS:
+        if not schema.validate(value):
+            return schema
+    raise TypeError('No schema accepts the value')
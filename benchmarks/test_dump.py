@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+import pytest
+
+from marshmallow_polyfield import PolyField
+from benchmarks.payloads import CARDINALITIES, SIZES, ShapeTypes, field_selector, field_values
+
+Parent = namedtuple('Parent', ['shapes'])
+
+
+@pytest.mark.parametrize('selector', ['class', 'instance'])
+@pytest.mark.parametrize('cardinality', CARDINALITIES)
+def test_dump_single(benchmark, cardinality, selector):
+    types = ShapeTypes(cardinality)
+    field = PolyField(
+        serialization_schema_selector=getattr(types, 'serialization_{0}_selector'.format(selector))
+    )
+    parent = Parent(types.objects(1)[0])
+
+    benchmark(field.serialize, 'shapes', parent)
+
+
+def test_dump_single_field(benchmark):
+    # Field targets are cheap, what remains is the PolyField dispatch itself
+    field = PolyField(serialization_schema_selector=field_selector)
+    parent = Parent(5)
+
+    assert benchmark(field.serialize, 'shapes', parent) == 5
+
+
+@pytest.mark.parametrize('selector', ['class', 'instance'])
+@pytest.mark.parametrize('cardinality', CARDINALITIES)
+@pytest.mark.parametrize('size', SIZES)
+def test_dump_many(benchmark, size, cardinality, selector):
+    types = ShapeTypes(cardinality)
+    field = PolyField(
+        serialization_schema_selector=getattr(types, 'serialization_{0}_selector'.format(selector)),
+        many=True
+    )
+    parent = Parent(types.objects(size))
+
+    result = benchmark(field.serialize, 'shapes', parent)
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_dump_many_fields(benchmark, size):
+    field = PolyField(serialization_schema_selector=field_selector, many=True)
+    parent = Parent(field_values(size))
+
+    result = benchmark(field.serialize, 'shapes', parent)
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('arrays', [False, True], ids=['lists', 'arrays'])
+@pytest.mark.parametrize('size', SIZES)
+def test_dump_many_columnar(benchmark, size, arrays):
+    types = ShapeTypes(2)
+    field = PolyField(
+        serialization_schema_selector=types.serialization_class_selector,
+        many=True,
+        columnar=True,
+        columnar_arrays=arrays
+    )
+    parent = Parent(types.objects(size))
+
+    result = benchmark(field.serialize, 'shapes', parent)
+    assert sum(len(table['color']) for table in result.values()) == size
@@ -0,0 +1,72 @@
+import pytest
+
+from marshmallow_polyfield import PolyField, StructuralPolyField
+from benchmarks.payloads import (
+    CARDINALITIES,
+    SIZES,
+    ShapeTypes,
+    field_selector,
+    field_values,
+    trial_selector,
+    untagged_values,
+)
+from tests.shapes import RectangleSchema, TriangleSchema
+
+
+@pytest.mark.parametrize('selector', ['class', 'instance'])
+@pytest.mark.parametrize('cardinality', CARDINALITIES)
+def test_load_single(benchmark, cardinality, selector):
+    types = ShapeTypes(cardinality)
+    field = PolyField(deserialization_schema_selector=getattr(types, selector + '_selector'))
+    value = types.raw_values(1)[0]
+
+    benchmark(field.deserialize, value)
+
+
+def test_load_single_field(benchmark):
+    # Field targets are cheap, what remains is the PolyField dispatch itself
+    field = PolyField(deserialization_schema_selector=field_selector)
+
+    assert benchmark(field.deserialize, 5) == 5
+
+
+@pytest.mark.parametrize('selector', ['class', 'instance'])
+@pytest.mark.parametrize('cardinality', CARDINALITIES)
+@pytest.mark.parametrize('size', SIZES)
+def test_load_many(benchmark, size, cardinality, selector):
+    types = ShapeTypes(cardinality)
+    field = PolyField(
+        deserialization_schema_selector=getattr(types, selector + '_selector'),
+        many=True
+    )
+    values = types.raw_values(size)
+
+    result = benchmark(field.deserialize, values)
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_load_many_fields(benchmark, size):
+    field = PolyField(deserialization_schema_selector=field_selector, many=True)
+    values = field_values(size)
+
+    result = benchmark(field.deserialize, values)
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_load_many_untagged_trial(benchmark, size):
+    field = PolyField(deserialization_schema_selector=trial_selector, many=True)
+    values = untagged_values(size)
+
+    result = benchmark(field.deserialize, values)
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_load_many_untagged_structural(benchmark, size):
+    field = StructuralPolyField(candidates=[TriangleSchema, RectangleSchema], many=True)
+    values = untagged_values(size)
+
+    result = benchmark(field.deserialize, values)
+    assert len(result) == size
@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+from tests.trees import balanced_tree, make_tree_schemas
+
+#: Nodes of the benchmarked trees
+TREE_NODES = int(os.environ.get('POLYFIELD_BENCH_TREE_NODES', '100000'))
+
+
+@pytest.mark.parametrize('iterative', [False, True], ids=['recursive', 'iterative'])
+def test_load_tree(benchmark, iterative):
+    group_schema = make_tree_schemas(iterative=iterative)[0]()
+    data = balanced_tree(TREE_NODES)
+
+    benchmark.pedantic(group_schema.load, (data,), rounds=3)
@@ -1,3 +1,27 @@
-from marshmallow_polyfield.polyfield import PolyField, PolyFieldBase
+from marshmallow_polyfield.polyfield import (
+    DiscriminatedPolyField,
+    ItemResult,
+    PolyField,
+    PolyFieldBase,
+    StructuralPolyField,
+    key_set_fingerprint,
+    type_fingerprint,
+)
+from marshmallow_polyfield.instrumentation import PolyFieldStats
+from marshmallow_polyfield.lazy import LazyPolyValue
+from marshmallow_polyfield.registry import SchemaRegistry
+from marshmallow_polyfield.warmup import warm_up
 
-__all__ = ['PolyField', 'PolyFieldBase']
+__all__ = [
+    'DiscriminatedPolyField',
+    'ItemResult',
+    'LazyPolyValue',
+    'PolyField',
+    'PolyFieldBase',
+    'PolyFieldStats',
+    'SchemaRegistry',
+    'StructuralPolyField',
+    'key_set_fingerprint',
+    'type_fingerprint',
+    'warm_up',
+]
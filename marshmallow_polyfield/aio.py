@@ -0,0 +1,142 @@
+"""
+Coroutine versions of PolyFieldBase loading and dumping, for selectors
+written with ``async def``. The selectors of a many=True list are awaited
+concurrently, at most ``async_concurrency`` at a time, and control goes
+back to the event loop between those batches so long lists do not block it
+"""
+import asyncio
+import inspect
+
+from marshmallow import ValidationError
+
+_NOT_CACHED = object()
+
+
+async def _select(selector, value, parent):
+    schema = selector(value, parent)
+    if inspect.isawaitable(schema):
+        schema = await schema
+    return schema
+
+
+async def _memoized(memo, fingerprint, value, parent, select):
+    if memo is None:
+        return await select(value, parent)
+    try:
+        key = fingerprint(value, parent)
+        target = memo.get(key)
+    except TypeError:
+        # Unhashable fingerprint, nothing to reuse
+        return await select(value, parent)
+    if target is None:
+        target = await select(value, parent)
+        memo.put(key, target)
+    return target
+
+
+async def resolve_deserializer(field, value, parent):
+    async def select(value, parent):
+        deserializer = None
+        try:
+            deserializer = await _select(field.deserialization_schema_selector, value, parent)
+            return field._deserializer_target(deserializer)
+        except ValidationError:
+            raise
+        except Exception as err:
+            raise field._selector_error(err, value, deserializer) from err
+
+    return await _memoized(
+        field._caches.deserialization, field.deserialization_fingerprint, value, parent, select
+    )
+
+
+async def resolve_serializer(field, value, obj):
+    async def select(value, obj):
+        return field._compile(await _select(field.serialization_schema_selector, value, obj))
+
+    return await _memoized(
+        field._caches.serialization, field.serialization_fingerprint, value, obj, select
+    )
+
+
+def _batches(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield start, values[start:start + size]
+
+
+async def deserialize(field, value, attr, parent, partial):
+    # The context is only installed around the synchronous loads, other
+    # tasks run on this thread while the selectors are awaited
+    propagate = field._context_propagator()
+    if not field.many:
+        target = await field._async_resolve_deserializer(value, parent, partial)
+        with propagate:
+            return target.load(value, attr, parent, partial, propagate)
+
+    results = []
+    errors = {}
+    for start, batch in _batches(value, field.async_concurrency):
+        targets = await asyncio.gather(
+            *(field._async_resolve_deserializer(v, parent, partial) for v in batch),
+            return_exceptions=True
+        )
+        with propagate:
+            for index, (v, target) in enumerate(zip(batch, targets), start):
+                try:
+                    if isinstance(target, BaseException):
+                        raise target
+                    results.append(target.load(v, attr, parent, partial, propagate))
+                except ValidationError as err:
+                    if not field.collect_errors:
+                        raise
+                    errors[index] = err.messages
+        await asyncio.sleep(0)
+
+    if errors:
+        raise ValidationError(errors, valid_data=results)
+    return results
+
+
+async def _dump_one(field, value, obj, propagate):
+    dump_cache = field._dump_cache_for(propagate)
+    if dump_cache is not None:
+        data = dump_cache.get(value, _NOT_CACHED)
+        if data is not _NOT_CACHED:
+            return data
+    target = await field._async_resolve_serializer(value, obj)
+    with propagate:
+        data = target.dump(value, propagate)
+    if dump_cache is not None:
+        dump_cache.put(value, data)
+    return data
+
+
+async def serialize(field, value, obj):
+    if value is None:
+        return None
+    propagate = field._context_propagator()
+    try:
+        if not field.many:
+            return await _dump_one(field, value, obj, propagate)
+
+        if field.columnar:
+            values = list(value)
+            targets = []
+            for _, batch in _batches(values, field.async_concurrency):
+                targets.extend(await asyncio.gather(
+                    *(field._async_resolve_serializer(v, obj) for v in batch)
+                ))
+            with propagate:
+                return field._dump_columns(zip(values, targets), propagate)
+
+        res = []
+        for _, batch in _batches(value, field.async_concurrency):
+            # Each dump runs without awaiting, so they never interleave
+            res.extend(await asyncio.gather(
+                *(_dump_one(field, v, obj, propagate) for v in batch)
+            ))
+            await asyncio.sleep(0)
+        return res
+    except Exception as err:
+        raise field._serialization_error(err, value) from err
@@ -0,0 +1,137 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A small least recently used mapping that keeps hit and miss counts.
+    Once maxsize entries are stored the least recently read one is dropped.
+    get, put and pop never raise under concurrent use: at worst an entry is
+    dropped or built twice, and the hit and miss counts are approximate
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            try:
+                self._data.popitem(last=False)
+            except KeyError:
+                break
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DumpCache(object):
+    """
+    Remembers what objects were dumped to, keyed by object identity and held
+    through weak references so it never keeps an object alive. An optional
+    version function lets mutable objects report when their entry is stale.
+    Objects that cannot be weakly referenced are never cached
+    """
+    def __init__(self, maxsize, version=None):
+        self._entries = LRUCache(maxsize)
+        self.version = version
+
+    def get(self, obj, default=None):
+        entry = self._entries.get(id(obj))
+        if entry is None:
+            return default
+        ref, version, data = entry
+        if ref() is not obj:
+            return default
+        if self.version is not None and self.version(obj) != version:
+            self._entries.pop(id(obj))
+            return default
+        return data
+
+    def put(self, obj, data):
+        key = id(obj)
+        entries = self._entries
+
+        def discard(ref):
+            entry = entries.get(key)
+            if entry is not None and entry[0] is ref:
+                entries.pop(key)
+
+        try:
+            ref = weakref.ref(obj, discard)
+        except TypeError:
+            return
+        version = self.version(obj) if self.version is not None else None
+        entries.put(key, (ref, version, data))
+
+    def invalidate(self, obj):
+        self._entries.pop(id(obj))
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self):
+        return self._entries.info()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FieldCaches(object):
+    """
+    The caches of one PolyField: compiled targets keyed by selector result
+    and, when selectors are memoized, the targets picked per fingerprint
+    for each direction
+    """
+    def __init__(self, schema_cache_size, selector_cache_size, memoize_selectors):
+        self.schemas = LRUCache(schema_cache_size) if schema_cache_size else None
+        if memoize_selectors:
+            self.deserialization = LRUCache(selector_cache_size)
+            self.serialization = LRUCache(selector_cache_size)
+        else:
+            self.deserialization = self.serialization = None
+
+
+class ThreadLocalFieldCaches(FieldCaches, threading.local):
+    """
+    FieldCaches that every thread gets its own copy of, so schema instances
+    are never shared between threads
+    """
@@ -0,0 +1,69 @@
+"""
+Column tables for the columnar dump of many=True PolyFields. Each dumped
+row is spread into the columns of its schema's table as soon as it is
+dumped, so the list of row dicts never exists
+"""
+from array import array
+
+#: Array type codes used for typed columns. Other values are kept in lists
+TYPECODES = {int: 'q', float: 'd'}
+
+
+def table_name(schema_class):
+    """Default table name of a schema or field class, its class name"""
+    return schema_class.__name__
+
+
+def _append(column, value):
+    """Appends value to column, returning the column to keep using"""
+    if type(column) is array:
+        if TYPECODES.get(type(value)) == column.typecode:
+            try:
+                column.append(value)
+                return column
+            except OverflowError:
+                pass
+        # Does not fit the array, fall back to a list
+        column = list(column)
+    column.append(value)
+    return column
+
+
+class Table(object):
+    """
+    The columns of the rows dumped with one schema. A row missing a column
+    has None in it. With typed, columns whose values are all ints or all
+    floats are stdlib arrays
+    """
+    __slots__ = ('columns', 'rows', 'typed')
+
+    def __init__(self, typed=False):
+        self.columns = {}
+        self.rows = 0
+        self.typed = typed
+
+    def append(self, row):
+        """Adds a dumped row, a dict or, for field targets, a single value"""
+        if not isinstance(row, dict):
+            row = {'value': row}
+        columns = self.columns
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                if self.rows:
+                    column = [None] * self.rows
+                    column.append(value)
+                elif self.typed and type(value) in TYPECODES:
+                    column = array(TYPECODES[type(value)], (value,))
+                else:
+                    column = [value]
+                columns[key] = column
+            else:
+                appended = _append(column, value)
+                if appended is not column:
+                    columns[key] = appended
+        self.rows += 1
+        if len(row) < len(columns):
+            for key, column in list(columns.items()):
+                if len(column) < self.rows:
+                    columns[key] = _append(column, None)
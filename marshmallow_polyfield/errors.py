@@ -0,0 +1,107 @@
+"""
+Error reporting helpers. Values are only ever shown through a bounded
+preview, so rejecting a huge payload costs the same as rejecting a small
+one, and every error raised by a PolyField carries a stable code
+"""
+from itertools import islice
+import reprlib
+
+#: Selector raised a TypeError, its message is reported as is
+SELECTOR_REJECTED = 'selector_rejected'
+#: Selector failed otherwise or returned something that cannot load
+SELECTOR_FAILED = 'selector_failed'
+#: Dumping a value failed
+SERIALIZATION_FAILED = 'serialization_failed'
+
+
+class _Repr(reprlib.Repr):
+    """
+    reprlib.Repr that shows the first elements of dicts and sets in
+    iteration order. The stock one sorts the whole container first
+    """
+    def repr_dict(self, x, level):
+        if not x:
+            return '{}'
+        if level <= 0:
+            return '{...}'
+        pieces = [
+            '{0}: {1}'.format(self.repr1(key, level - 1), self.repr1(value, level - 1))
+            for key, value in islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append('...')
+        return '{%s}' % ', '.join(pieces)
+
+    def repr_set(self, x, level):
+        if not x:
+            return 'set()'
+        return self._repr_iterable(x, level, '{', '}', self.maxset)
+
+    def repr_frozenset(self, x, level):
+        if not x:
+            return 'frozenset()'
+        return self._repr_iterable(x, level, 'frozenset({', '})', self.maxfrozenset)
+
+
+_repr = _Repr()
+_repr.maxlevel = 2
+_repr.maxdict = 4
+_repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxfrozenset = 4
+_repr.maxstring = _repr.maxother = 40
+
+#: Longest preview returned
+PREVIEW_LENGTH = 160
+
+
+def preview(value):
+    """A repr of value truncated to a few elements and characters"""
+    text = _repr.repr(value)
+    if len(text) > PREVIEW_LENGTH:
+        text = text[:PREVIEW_LENGTH - 3] + '...'
+    return text
+
+
+def preview_keys(keys):
+    """
+    A preview of a collection of keys as a list. Only the keys shown are
+    sorted, so small key sets read the same every time
+    """
+    return preview(sorted(islice(keys, _repr.maxlist + 1), key=str))
+
+
+class SerializationError(TypeError):
+    """
+    Raised when a PolyField fails to dump a value. The message is only
+    rendered when the error is turned into a string. The value is kept out
+    of args and is not pickled, an unpickled error only has its preview
+    and a value of None
+    """
+    code = SERIALIZATION_FAILED
+
+    def __init__(self, error, value):
+        super().__init__(error)
+        self.error = error
+        self.value = value
+        self._preview = None
+
+    def _value_preview(self):
+        if self._preview is None:
+            return preview(self.value)
+        return self._preview
+
+    def __str__(self):
+        return (
+            'Failed to serialize object. Error: {0}\n'
+            ' Ensure the serialization_schema_selector exists and '
+            ' returns a Schema and that schema'
+            ' can serialize this value {1}'.format(self.error, self._value_preview())
+        )
+
+    def __reduce__(self):
+        return _unpickle_serialization_error, (type(self), self.error, self._value_preview())
+
+
+def _unpickle_serialization_error(cls, error, value_preview):
+    err = cls(error, None)
+    err._preview = value_preview
+    return err
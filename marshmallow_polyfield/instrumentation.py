@@ -0,0 +1,73 @@
+import threading
+import time
+
+#: Schema type name used for selector calls that failed before picking a schema
+UNRESOLVED = '<unresolved>'
+
+
+def _new_counters():
+    return {
+        'selections': 0,
+        'selector_time': 0.0,
+        'loads': 0,
+        'load_time': 0.0,
+        'dumps': 0,
+        'dump_time': 0.0,
+        'errors': 0,
+    }
+
+
+class PolyFieldStats(object):
+    """
+    Counters and timings of a PolyField per resolved schema type. Pass an
+    instance as the instrumentation of one or more fields, then read it
+    with as_dict() or hand it to a metrics pipeline with flush()
+
+    errors counts the values that failed, not the calls. Loads and dumps
+    count every attempt: with batch and collect_errors, a group that fails
+    is loaded again value by value and its values are counted again
+    """
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, callback=None):
+        """
+        :param callback: Called by flush with the collected stats as a dict
+        """
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, schema, event, seconds, count=1, error=False):
+        """
+        Records count selections, loads or dumps (event is 'select', 'load'
+        or 'dump') that used schema and took seconds in total. schema is
+        None when a selector failed before returning one. error is True
+        when the single value failed, or the number of the count values that
+        failed
+        """
+        name = UNRESOLVED if schema is None else type(schema).__name__
+        with self._lock:
+            counters = self._stats.get(name)
+            if counters is None:
+                counters = self._stats[name] = _new_counters()
+            if event == 'select':
+                counters['selections'] += count
+                counters['selector_time'] += seconds
+            else:
+                counters[event + 's'] += count
+                counters[event + '_time'] += seconds
+            if error:
+                counters['errors'] += error
+
+    def as_dict(self):
+        """Returns a copy of the stats keyed by schema type name"""
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._stats.items()}
+
+    def flush(self):
+        """Returns the stats collected so far, passes them to callback and resets them"""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        if self.callback is not None:
+            self.callback(stats)
+        return stats
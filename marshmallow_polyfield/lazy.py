@@ -0,0 +1,68 @@
+class _NotLoaded(object):
+    """Marks an unresolved value. Copies and unpickled values get the same instance"""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_NOT_LOADED'
+
+
+_NOT_LOADED = _NotLoaded()
+
+
+class LazyPolyValue(object):
+    """
+    Stand-in returned by a lazy PolyField. It keeps the raw value and only
+    runs the selector and the load on first attribute access or on an
+    explicit resolve(). Validation errors are raised at that point
+    """
+    __slots__ = ('_field', '_value', '_attr', '_parent', '_partial', '_context', '_loaded')
+
+    _NOT_LOADED = _NOT_LOADED
+
+    def __init__(self, field, value, attr, parent, partial, context):
+        self._field = field
+        self._value = value
+        self._attr = attr
+        self._parent = parent
+        self._partial = partial
+        self._context = context
+        self._loaded = self._NOT_LOADED
+
+    @property
+    def raw(self):
+        """The value as it was passed to the field"""
+        return self._value
+
+    @property
+    def resolved(self):
+        return self._loaded is not self._NOT_LOADED
+
+    def resolve(self):
+        """Loads the value on first call and returns the loaded object"""
+        if self._loaded is self._NOT_LOADED:
+            self._loaded = self._field._load_lazy(
+                self._value, self._attr, self._parent, self._partial, self._context
+            )
+        return self._loaded
+
+    def __getattr__(self, name):
+        # Private and special names are never forwarded, so copy, pickle and
+        # hasattr probes neither load the value nor recurse into an empty one
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __eq__(self, other):
+        if isinstance(other, LazyPolyValue):
+            other = other.resolve()
+        return self.resolve() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self.resolved:
+            return '<LazyPolyValue {0!r}>'.format(self._loaded)
+        return '<LazyPolyValue unresolved>'
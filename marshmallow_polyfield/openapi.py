@@ -0,0 +1,69 @@
+"""
+OpenAPI descriptions of PolyFields built from their declared candidate
+schemas. Schemas become ``$ref`` entries of a ``oneOf`` and fields are
+described by their JSON type, so gateways can validate payloads before
+they reach the application
+"""
+from marshmallow import Schema, fields
+
+REF_PREFIX = '#/components/schemas/'
+
+# Checked in order, Integer is a Number
+_FIELD_TYPES = (
+    (fields.Boolean, 'boolean'),
+    (fields.Integer, 'integer'),
+    (fields.Number, 'number'),
+    (fields.String, 'string'),
+    (fields.List, 'array'),
+    (fields.Tuple, 'array'),
+    (fields.Mapping, 'object'),
+)
+
+
+def schema_name(schema_class):
+    """Default component name of a schema, its class name"""
+    return schema_class.__name__
+
+
+def _as_class(schema):
+    return schema if isinstance(schema, type) else type(schema)
+
+
+def reference(schema, name_resolver=schema_name, ref_prefix=REF_PREFIX):
+    """Returns the ``$ref`` object pointing at the component of schema"""
+    return {'$ref': ref_prefix + name_resolver(_as_class(schema))}
+
+
+def describe(schema, name_resolver=schema_name, ref_prefix=REF_PREFIX):
+    """
+    Describes one candidate: a reference for a schema, the JSON type for a
+    field. Fields of unknown type accept any value
+    """
+    schema_class = _as_class(schema)
+    if issubclass(schema_class, Schema):
+        return reference(schema_class, name_resolver, ref_prefix)
+    for field_class, json_type in _FIELD_TYPES:
+        if issubclass(schema_class, field_class):
+            return {'type': json_type}
+    return {}
+
+
+def one_of(field, name_resolver=None, ref_prefix=REF_PREFIX, discriminator=None):
+    """
+    Builds the OpenAPI description of field from its candidate_schemas.
+    discriminator is the ``discriminator`` object to attach, if any
+    """
+    name_resolver = name_resolver or schema_name
+    variants = []
+    for schema in field.candidate_schemas:
+        variant = describe(schema, name_resolver, ref_prefix)
+        if variant not in variants:
+            variants.append(variant)
+    spec = {'oneOf': variants}
+    if discriminator is not None:
+        spec['discriminator'] = discriminator
+    if field.many:
+        spec = {'type': 'array', 'items': spec}
+    if field.allow_none:
+        spec['nullable'] = True
+    return spec
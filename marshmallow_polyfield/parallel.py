@@ -0,0 +1,57 @@
+"""
+Loading of large many=True PolyField lists on a concurrent.futures executor.
+
+Workers keep the fields they have been sent, keyed by a token, so a field
+(with its selectors and schemas) is unpickled and its schemas built only
+once per worker process. The field is pickled once per call and sent
+along with every chunk, a worker that already knows the token ignores it
+"""
+import pickle
+
+from marshmallow import ValidationError
+
+_worker_fields = {}
+
+
+def load_chunk(token, payload, values, attr, parent, context, partial):
+    """Runs in the worker. Returns a (results, errors) pair for the chunk"""
+    field = _worker_fields.get(token)
+    if field is None:
+        field = _worker_fields[token] = pickle.loads(payload)
+    return field._load_chunk(values, attr, parent, context, partial)
+
+
+def deserialize(field, value, attr, parent, partial):
+    chunk_size = field.parallel_chunk_size
+    executor = field.executor
+    # A plain copy, the context proxy of a cached schema does not pickle its calls
+    context = dict(field._call_context() or {})
+    if isinstance(parent, dict):
+        # The list itself is already shipped in chunks
+        parent = {key: item for key, item in parent.items() if item is not value}
+
+    payload = pickle.dumps(field)
+    starts = range(0, len(value), chunk_size)
+    futures = [
+        executor.submit(
+            load_chunk, field._parallel_token, payload,
+            value[start:start + chunk_size], attr, parent, context, partial
+        )
+        for start in starts
+    ]
+    results = []
+    errors = {}
+    for start, future in zip(starts, futures):
+        chunk_results, chunk_errors = future.result()
+        for index, messages in chunk_errors.items():
+            errors[start + index] = messages
+        results.extend(chunk_results)
+
+    if errors:
+        if not field.collect_errors:
+            raise ValidationError(errors[min(errors)])
+        raise ValidationError(
+            errors,
+            valid_data=[data for index, data in enumerate(results) if index not in errors]
+        )
+    return results
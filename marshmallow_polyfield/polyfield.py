@@ -1,96 +1,1287 @@
 import abc
-import contextlib
+import threading
+import uuid
+from collections import ChainMap, namedtuple
+from collections.abc import Mapping, MutableMapping
 
-from marshmallow import Schema, ValidationError
+from marshmallow import RAISE, Schema, ValidationError
+from marshmallow import fields as ma_fields
+from marshmallow.decorators import PRE_LOAD
 from marshmallow.fields import Field
+try:
+    from marshmallow.validate import And
+except ImportError:
+    # marshmallow < 3.12, fields validate with their own _validate
+    And = None
+from marshmallow.utils import missing
+
+from marshmallow_polyfield import aio, columnar, errors, openapi, parallel
+from marshmallow_polyfield.cache import DumpCache, FieldCaches, LRUCache, ThreadLocalFieldCaches
+from marshmallow_polyfield.lazy import LazyPolyValue
+
+_NOT_CACHED = object()
+
+
+#: Outcome of one element of PolyFieldBase.iter_deserialize / iter_serialize.
+#: errors is None when the element was processed successfully
+ItemResult = namedtuple('ItemResult', ['index', 'data', 'errors'])
+
+
+def key_set_fingerprint(value, parent):
+    """
+    Fingerprint for untagged data whose schema only depends on which keys
+    are present. Values that are not mappings are keyed on their type
+    """
+    if isinstance(value, Mapping):
+        return frozenset(value)
+    return type(value)
+
+
+def type_fingerprint(value, parent):
+    """Fingerprint for selectors that only look at the type of the value"""
+    return type(value)
+
+
+def _has_pre_load(schema):
+    """Whether the schema runs pre_load hooks, which may reshape its data"""
+    for key, hooks in schema._hooks.items():
+        # Keyed by (tag, pass_many) in older marshmallow releases, by tag later
+        tag = key[0] if isinstance(key, tuple) else key
+        if tag == PRE_LOAD and hooks:
+            return True
+    return False
+
+
+def _required_keys(schema):
+    """The keys a Schema instance needs in the data it loads"""
+    return frozenset(
+        field.data_key or name for name, field in schema.load_fields.items() if field.required
+    )
+
+
+class _NoContext(object):
+    """Stands in for a _ContextPropagator when the field has no context"""
+    __slots__ = ()
+
+    def __call__(self, schema):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_no_context = _NoContext()
+
+
+class _SchemaContext(MutableMapping):
+    """
+    The context of a schema instance that PolyFields load and dump with.
+    Cached instances are shared between calls and threads, so the context
+    of a field is installed here for the length of one call on the calling
+    thread only. Outside of such a call it is the schema's own context
+    """
+    __slots__ = ('base', '_local')
+
+    def __init__(self, base):
+        self.base = base
+        self._local = threading.local()
+
+    @property
+    def current(self):
+        return getattr(self._local, 'context', self.base)
+
+    def swap(self, context):
+        """Installs context for the calling thread and returns what it replaced"""
+        local = self._local
+        previous = getattr(local, 'context', _NOT_CACHED)
+        local.context = ChainMap(context, self.base) if self.base else context
+        return previous
+
+    def restore(self, previous):
+        if previous is _NOT_CACHED:
+            del self._local.context
+        else:
+            self._local.context = previous
+
+    def __getitem__(self, key):
+        return self.current[key]
+
+    def __setitem__(self, key, value):
+        self.current[key] = value
+
+    def __delitem__(self, key):
+        del self.current[key]
+
+    def __iter__(self):
+        return iter(self.current)
+
+    def __len__(self):
+        return len(self.current)
+
+    def __repr__(self):
+        return repr(self.current)
+
+    def __bool__(self):
+        # Nested schemas built later take their parent's context with
+        # `context or {}`, they must get the proxy even while it is empty
+        return True
+
+    def __reduce__(self):
+        return _SchemaContext, (self.base,)
+
+
+_wrap_lock = threading.Lock()
+
+
+def _schema_context(schema):
+    """The _SchemaContext of schema, installed on first use"""
+    schema_context = schema.context
+    if type(schema_context) is _SchemaContext:
+        return schema_context
+    # Threads sharing a fresh instance must all swap into the same proxy
+    with _wrap_lock:
+        schema_context = schema.context
+        if type(schema_context) is not _SchemaContext:
+            schema_context = schema.context = _SchemaContext(schema_context)
+            _share_context(schema, schema_context)
+    return schema_context
+
+
+def _share_context(schema, schema_context):
+    """
+    Points the nested schemas of schema at schema_context. Nested fields
+    build their schema once and copy the context they see at that point,
+    which for a cached schema would be the context of whatever call came
+    first. They are built now and handed the proxy instead
+    """
+    seen = {type(schema)}
+    stack = list(schema.fields.values())
+    while stack:
+        field = stack.pop()
+        if isinstance(field, ma_fields.Nested):
+            nested = field.schema
+            nested.context = schema_context
+            # Deeper levels of recursive schemas are built later, from this
+            # context
+            if type(nested) not in seen:
+                seen.add(type(nested))
+                stack.extend(nested.fields.values())
+        elif isinstance(field, ma_fields.List):
+            stack.append(field.inner)
+        elif isinstance(field, ma_fields.Tuple):
+            stack.extend(field.tuple_fields)
+        elif isinstance(field, ma_fields.Mapping):
+            stack.extend(f for f in (field.key_field, field.value_field) if f is not None)
+
+
+class _ContextPropagator(object):
+    """
+    Installs the context of a field in the schemas it (de)serializes with,
+    for one call of the field. Use it as a context manager around the
+    loads and dumps: on exit every schema gets back the context it had.
+    Runs of elements using the same schema only look it up once. Field
+    targets are left alone, they keep seeing the context of the schema
+    they are bound to, if any
+    """
+    __slots__ = ('context', 'last', 'saved')
+
+    def __init__(self, context):
+        if isinstance(context, _SchemaContext):
+            context = context.current
+        self.context = context
+        self.last = None
+        self.saved = {}
+
+    def __enter__(self):
+        self.last = None
+        return self
+
+    def __exit__(self, *exc_info):
+        for schema_context, previous in reversed(list(self.saved.values())):
+            schema_context.restore(previous)
+        self.saved.clear()
+        self.last = None
+
+    def __call__(self, schema):
+        if schema is self.last:
+            return
+        self.last = schema
+        if not isinstance(schema, Schema):
+            return
+        schema_context = _schema_context(schema)
+        key = id(schema_context)
+        if key not in self.saved:
+            self.saved[key] = (schema_context, schema_context.swap(self.context))
+
+
+class _Target(object):
+    """
+    A schema or field picked by a selector, with the calls used to load and
+    dump with it specialized once for its type. load is None when the
+    target is neither a Field nor a Schema, load_many is None unless it is
+    a Schema or a Field with the stock deserialize and validation. tag is
+    the type tag written by the target, if any
+    """
+    __slots__ = ('schema', 'tag', 'load', 'dump', 'load_many', 'dump_many')
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.tag = None
+        if isinstance(schema, Schema):
+            schema_load = schema.load
+
+            def load(value, attr, parent, partial, propagate):
+                propagate(schema)
+                return schema_load(value, partial=partial)
+
+            def load_many(values, attr, parent, partial, propagate):
+                propagate(schema)
+                return schema_load(values, many=True, partial=partial)
+        elif isinstance(schema, Field):
+            load, load_many = _field_loaders(schema)
+        else:
+            load = load_many = None
+        self.load = load
+        self.load_many = load_many
+
+        schema_dump = getattr(schema, 'dump', None)
+        if schema_dump is not None:
+            def dump(value, propagate):
+                propagate(schema)
+                return schema_dump(value)
+
+            def dump_many(values, propagate):
+                propagate(schema)
+                return schema_dump(values, many=True)
+        else:
+            def dump(value, propagate):
+                return schema._serialize(value, None, None)
+
+            def dump_many(values, propagate):
+                return [schema._serialize(value, None, None) for value in values]
+        self.dump = dump
+        self.dump_many = dump_many
+
+
+class _TaggedTarget(object):
+    """
+    The target of one tag of a DiscriminatedPolyField. The tag is removed
+    before loading with a schema that does not declare it and added back
+    after dumping
+    """
+    __slots__ = ('schema', 'tag', 'load', 'dump', 'load_many', 'dump_many')
+
+    def __init__(self, target, discriminator, tag, strip, emit):
+        self.schema = target.schema
+        self.tag = tag
+        self.load, self.load_many = target.load, target.load_many
+        self.dump, self.dump_many = target.dump, target.dump_many
+        if strip:
+            self._untag_loads(target, discriminator)
+        if emit:
+            self._tag_dumps(target, discriminator, tag)
+
+    def _untag_loads(self, target, discriminator):
+        target_load, target_load_many = target.load, target.load_many
+
+        def untag(value):
+            value = dict(value)
+            del value[discriminator]
+            return value
+
+        def load(value, attr, parent, partial, propagate):
+            return target_load(untag(value), attr, parent, partial, propagate)
+
+        def load_many(values, attr, parent, partial, propagate):
+            return target_load_many(
+                [untag(v) for v in values], attr, parent, partial, propagate
+            )
+        self.load = load
+        self.load_many = load_many if target_load_many is not None else None
+
+    def _tag_dumps(self, target, discriminator, tag):
+        target_dump, target_dump_many = target.dump, target.dump_many
+
+        def dump(value, propagate):
+            data = target_dump(value, propagate)
+            data[discriminator] = tag
+            return data
+
+        def dump_many(values, propagate):
+            dumped = target_dump_many(values, propagate)
+            for data in dumped:
+                data[discriminator] = tag
+            return dumped
+        self.dump = dump
+        self.dump_many = dump_many
+
+
+def _field_loaders(field):
+    """
+    Returns the load and load_many of a Field target. Unless the field
+    class changes how it deserializes or validates, the missing and None
+    checks only run for those values and the validators are combined once
+    rather than per call. load_many then validates each distinct value of
+    a group once
+    """
+    deserialize = field.deserialize
+    field_class = type(field)
+    if (field_class.deserialize is not Field.deserialize
+            or field_class._validate is not Field._validate):
+        def load(value, attr, parent, partial, propagate):
+            return deserialize(value, attr, parent)
+        return load, None
+
+    convert = field._deserialize
+    if not field.validators:
+        validate = None
+    elif And is None:
+        validate = field._validate
+    else:
+        validate = And(*field.validators, error=field.error_messages['validator_failed'])
+
+    def load(value, attr, parent, partial, propagate):
+        if value is None or value is missing:
+            return deserialize(value, attr, parent)
+        output = convert(value, attr, parent)
+        if validate is not None:
+            validate(output)
+        return output
+
+    def load_many(values, attr, parent, partial, propagate):
+        outputs = []
+        pending = []
+        errors = {}
+        for index, value in enumerate(values):
+            try:
+                if value is None:
+                    outputs.append(deserialize(value, attr, parent))
+                    continue
+                outputs.append(convert(value, attr, parent))
+            except ValidationError as err:
+                errors[index] = err.messages
+                outputs.append(None)
+                continue
+            pending.append(index)
+        if validate is not None:
+            failures = {}
+            for index in pending:
+                output = outputs[index]
+                key = (type(output), output)
+                try:
+                    messages = failures.get(key, _NOT_CACHED)
+                except TypeError:
+                    # Unhashable output, validated on its own
+                    messages = key = _NOT_CACHED
+                if messages is _NOT_CACHED:
+                    try:
+                        validate(output)
+                        messages = None
+                    except ValidationError as err:
+                        messages = err.messages
+                    if key is not _NOT_CACHED:
+                        failures[key] = messages
+                if messages is not None:
+                    errors[index] = messages
+        if errors:
+            raise ValidationError(errors)
+        return outputs
+    return load, load_many
+
+
+def _load_default(field):
+    # load_default and dump_default replaced missing and default in marshmallow 3.13
+    try:
+        return field.load_default
+    except AttributeError:
+        return field.missing
+
+
+def _dump_default(field):
+    try:
+        return field.dump_default
+    except AttributeError:
+        return field.default
+
+
+class _Preloaded(object):
+    """
+    A value already loaded by an iterative tree load, handed to the schema
+    of its parent in place of the raw data
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _TreeNode(object):
+    """One PolyField value met while walking a tree for an iterative load"""
+    __slots__ = ('field', 'value', 'attr', 'parent', 'path', 'load', 'children', 'result')
+
+    def __init__(self, field, value, attr, parent, path):
+        self.field = field
+        self.value = value
+        self.attr = attr
+        self.parent = parent
+        self.path = path
+        self.children = []
+
+
+def _error_at(path, err):
+    messages = err.messages
+    for key in reversed(path):
+        messages = {key: messages}
+    return ValidationError(messages)
+
+
+class _InstrumentedTarget(object):
+    """A _Target whose calls report their time to an instrumentation"""
+    __slots__ = ('schema', 'tag', 'load', 'dump', 'load_many', 'dump_many')
+
+    def __init__(self, target, instrumentation):
+        schema = self.schema = target.schema
+        self.tag = target.tag
+        record = instrumentation.record
+        clock = instrumentation.clock
+
+        def timed(event, call, count_values):
+            if call is None:
+                return None
+
+            def wrapper(values, *args):
+                start = clock()
+                count = len(values) if count_values else 1
+                try:
+                    result = call(values, *args)
+                except Exception as err:
+                    # A many=True load reports the failing values by index
+                    messages = getattr(err, 'messages', None) if count_values else None
+                    failed = len(messages) if isinstance(messages, dict) else count
+                    record(schema, event, clock() - start, count, error=failed)
+                    raise
+                record(schema, event, clock() - start, count)
+                return result
+            return wrapper
+
+        self.load = timed('load', target.load, False)
+        self.dump = timed('dump', target.dump, False)
+        self.load_many = timed('load', target.load_many, True)
+        self.dump_many = timed('dump', target.dump_many, True)
 
 
 class PolyFieldBase(Field, metaclass=abc.ABCMeta):
-    def __init__(self, many=False, **metadata):
+    default_error_messages = {
+        'invalid': 'Invalid input type. Expected a mapping.',
+        'invalid_list': 'Not a valid list.',
+        'missing_keys': 'Missing the required keys of every candidate schema.',
+    }
+
+    def __init__(
+            self,
+            many=False,
+            schema_cache_size=128,
+            batch=False,
+            collect_errors=False,
+            memoize_selectors=False,
+            deserialization_fingerprint=key_set_fingerprint,
+            serialization_fingerprint=type_fingerprint,
+            selector_cache_size=128,
+            thread_local_cache=False,
+            executor=None,
+            parallel_threshold=10000,
+            parallel_chunk_size=1000,
+            async_concurrency=64,
+            instrumentation=None,
+            lazy=False,
+            iterative=False,
+            columnar=False,
+            columnar_arrays=False,
+            columnar_name_resolver=None,
+            dump_cache_size=0,
+            dump_cache_version=None,
+            candidate_schemas=None,
+            precheck=False,
+            error_budget=None,
+            **metadata
+    ):
+        """
+        :param many: Whether the field holds a list of values
+        :param schema_cache_size: How many selector results to keep compiled.
+        When a selector returns a schema or field class the instance built
+        from it is reused across elements and calls, least recently used
+        first out. Pass 0 to build a new instance every time
+        :param batch: With many, group the elements by the schema their
+        selector picks and load/dump each group with a single many=True
+        call. Errors are then keyed by the index of the failing element
+        :param collect_errors: With many, validate every element instead of
+        stopping at the first bad one. The raised ValidationError maps each
+        failing index to its messages and its valid_data holds the elements
+        that loaded
+        :param memoize_selectors: Only call the selectors once per fingerprint
+        of the value and reuse the schema they picked. Only use this when the
+        selectors give the same answer for values with the same fingerprint
+        :param deserialization_fingerprint: Function taking the value and its
+        parent data and returning a hashable fingerprint. Defaults to the set
+        of keys of the value
+        :param serialization_fingerprint: Same as above for serialization.
+        Defaults to the type of the value
+        :param selector_cache_size: How many fingerprints to remember per
+        direction
+        :param thread_local_cache: Give every thread its own caches, so the
+        schema instances a selector builds from a class are reused within a
+        thread but not shared between threads. Schemas that are instances
+        already are shared whatever this option, as are the mapping schemas
+        of DiscriminatedPolyField and their targets and the candidates of
+        StructuralPolyField, which are built once per field. The context of
+        a call is kept per thread in either mode, so only use it when the
+        target schemas keep other state of their own
+        :param executor: A concurrent.futures executor, usually a
+        ProcessPoolExecutor, used to load long many=True lists in chunks.
+        The field, its selectors, the parent data and the context must be
+        picklable. The field travels with every chunk but each worker
+        unpickles it and builds its schemas only once
+        :param parallel_threshold: Lists shorter than this are loaded in
+        process even when an executor is set
+        :param parallel_chunk_size: Number of elements sent to a worker at once
+        :param async_concurrency: How many selectors async_deserialize and
+        async_serialize await at once for a many=True list
+        :param instrumentation: A PolyFieldStats (or any object with the same
+        record method and clock) that receives per schema type counts and
+        timings of the selector calls, loads and dumps. Async selectors and
+        parallel workers are not timed
+        :param lazy: Return a LazyPolyValue (a list of them with many) that
+        only selects and loads the value when it is first used. Validation
+        errors are then raised by LazyPolyValue.resolve(). Values are
+        resolved synchronously, so with async_deserialize the selectors must
+        be regular functions
+        :param iterative: Load trees of schemas holding PolyFields with an
+        explicit stack instead of recursion, so their depth is not bound by
+        the recursion limit. Each value is loaded once its PolyField
+        children are, and child PolyFields only hand back the loaded result;
+        their own batch, lazy, precheck and collect_errors options are not
+        applied. Errors are keyed by the full path to the failing value. The
+        walk stops at schemas with pre_load hooks, which load their children
+        themselves. Cannot be combined with batch
+        :param columnar: Dump many=True lists as one table per schema,
+        {schema class name: {column: [values...]}}, filling each row in as it
+        is dumped. Rows missing a column hold None; field targets fill a
+        single "value" column. The dump cache is not used
+        :param columnar_arrays: With columnar, keep columns holding only ints
+        or only floats in stdlib arrays
+        :param columnar_name_resolver: With columnar, function taking a schema
+        or field class and returning the name of its table, the class name
+        by default. Two classes resolving to the same name raise
+        :param dump_cache_size: How many dumped objects to remember, keyed by
+        identity through weak references. A remembered object skips the
+        selector, schema and dump entirely. Cached output is shared, treat it
+        as read-only. Disabled by default; not used in batch mode nor when
+        the field has a context
+        :param dump_cache_version: Function returning a version key for an
+        object. When it changes the object is dumped again. Without it use
+        invalidate_dump() after mutating a cached object
+        :param candidate_schemas: Every schema or field (class or instance)
+        the selectors may return. They are built and cached when the field
+        is created instead of on first use, and describe the field in
+        openapi_schema(). Pass the same objects the selectors return
+        :param precheck: Check the shape of the whole input before loading
+        anything and reject it at once if an element is bad. True checks
+        elements are mappings holding the required keys of at least one
+        candidate schema (the discriminator for DiscriminatedPolyField), a
+        function taking an element and returning an error message or None
+        is used as is
+        :param error_budget: With precheck, stop checking after this many bad
+        elements. By default every element is checked
+
+        """
+        if iterative and batch:
+            raise ValueError('iterative cannot be combined with batch')
         super().__init__(**metadata)
         self.many = many
+        self.batch = batch
+        self.collect_errors = collect_errors
+        self.schema_cache_size = schema_cache_size
+        self.deserialization_fingerprint = deserialization_fingerprint
+        self.serialization_fingerprint = serialization_fingerprint
+        self.executor = executor
+        self.parallel_threshold = parallel_threshold
+        self.parallel_chunk_size = parallel_chunk_size
+        self.async_concurrency = async_concurrency
+        self.instrumentation = instrumentation
+        self.lazy = lazy
+        self.iterative = iterative
+        self.columnar = columnar
+        self.columnar_arrays = columnar_arrays
+        self.columnar_name_resolver = columnar_name_resolver
+        self._child_polyfields = LRUCache(schema_cache_size or 1)
+        self._dump_cache = (
+            DumpCache(dump_cache_size, dump_cache_version) if dump_cache_size else None
+        )
+        self._parallel_token = uuid.uuid4().hex
+        self._caches_class = ThreadLocalFieldCaches if thread_local_cache else FieldCaches
+        self._caches_args = (schema_cache_size, selector_cache_size, memoize_selectors)
+        self._caches = self._caches_class(*self._caches_args)
+        self.candidate_schemas = (
+            tuple(candidate_schemas) if candidate_schemas is not None else None
+        )
+        self._warm_candidates()
+        self.precheck = precheck
+        self.error_budget = error_budget
+        self._precheck = None
 
-    def _deserialize(self, value, attr, parent, partial=None, **kwargs):
-        if not self.many:
-            value = [value]
+    def __copy__(self):
+        # Schemas copy their fields, the copies share the caches
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
 
-        results = []
-        for v in value:
-            deserializer = None
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Caches, the executor and the parent schema stay in this process
+        state.update(
+            _caches=None, _dump_cache=None, _precheck=None, _child_polyfields=None,
+            executor=None, instrumentation=None, parent=None, root=None
+        )
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._caches = self._caches_class(*self._caches_args)
+        self._child_polyfields = LRUCache(self.schema_cache_size or 1)
+        self._warm_candidates()
+
+    def _warm_candidates(self):
+        return [self._compile(schema).schema for schema in self.candidate_schemas or ()]
+
+    def warm_up(self):
+        """
+        Builds and caches the targets of every candidate schema now, for
+        example before forking workers, and returns them. Fields already do
+        this when created; call it again after clearing caches or, with
+        thread_local_cache, from each thread
+        """
+        return self._warm_candidates()
+
+    def openapi_schema(self, schema_name_resolver=None, ref_prefix=openapi.REF_PREFIX):
+        """
+        Describes the field as an OpenAPI ``oneOf`` of its candidate_schemas,
+        with a ``discriminator`` when the field has one. Schemas are
+        referenced as components, name them with schema_name_resolver
+        (schema class to name, the class name by default)
+        """
+        if self.candidate_schemas is None:
+            raise ValueError('The field declares no candidate_schemas to describe')
+        name_resolver = schema_name_resolver or openapi.schema_name
+        return openapi.one_of(
+            self, name_resolver, ref_prefix,
+            self._openapi_discriminator(name_resolver, ref_prefix)
+        )
+
+    def _openapi_discriminator(self, name_resolver, ref_prefix):
+        return None
+
+    def selector_cache_info(self):
+        """
+        Hit and miss statistics of the memoized selectors, or None when
+        memoize_selectors is off. With thread_local_cache these are the
+        statistics of the calling thread
+        """
+        caches = self._caches
+        if caches.deserialization is None:
+            return None
+        return {
+            'deserialization': caches.deserialization.info(),
+            'serialization': caches.serialization.info(),
+        }
+
+    def _compile(self, schema):
+        """
+        Returns the _Target for what a selector returned, building the
+        instance first when it is a class. Targets are cached per selector
+        result so a steady state costs a single lookup
+        """
+        cache = self._caches.schemas
+        target = _NOT_CACHED
+        if cache is not None:
             try:
-                deserializer = self.deserialization_schema_selector(v, parent)
-                if isinstance(deserializer, type):
-                    deserializer = deserializer()
-                if not isinstance(deserializer, (Field, Schema)):
-                    raise Exception('Invalid deserializer type')
-            except TypeError as te:
-                raise ValidationError(str(te)) from te
-            except ValidationError:
-                raise
-            except Exception as err:
-                class_type = None
-                if deserializer:
-                    class_type = str(type(deserializer))
-
-                raise ValidationError(
-                    "Unable to use schema. Error: {err}\n"
-                    "Ensure there is a deserialization_schema_selector"
-                    " and then it returns a field or a schema when the function is passed in "
-                    "{value_passed}. This is the class I got. "
-                    "Make sure it is a field or a schema: {class_type}".format(
-                        err=err,
-                        value_passed=v,
-                        class_type=class_type
-                    )
-                ) from err
+                target = cache.get(schema, _NOT_CACHED)
+            except TypeError:
+                # Unhashable selector result
+                cache = None
+        if target is _NOT_CACHED:
+            target = _Target(schema() if isinstance(schema, type) else schema)
+            if self.instrumentation is not None:
+                target = _InstrumentedTarget(target, self.instrumentation)
+            if cache is not None:
+                cache.put(schema, target)
+        return target
+
+    @staticmethod
+    def _memoized(memo, fingerprint, value, parent, resolve):
+        try:
+            key = fingerprint(value, parent)
+            schema = memo.get(key, _NOT_CACHED)
+        except TypeError:
+            # Unhashable fingerprint, nothing to reuse
+            return resolve(value, parent)
+        if schema is _NOT_CACHED:
+            schema = resolve(value, parent)
+            memo.put(key, schema)
+        return schema
+
+    def _resolve_deserializer(self, value, parent, partial=None):
+        memo = self._caches.deserialization
+        if memo is None and self.instrumentation is None:
+            return self._pick_deserializer(value, parent, partial)
+        if memo is None:
+            return self._select_deserializer(value, parent, partial)
+        return self._memoized(
+            memo, self.deserialization_fingerprint,
+            value, parent, self._select_deserializer
+        )
+
+    def _timed_select(self, select, value, parent, *args):
+        instrumentation = self.instrumentation
+        start = instrumentation.clock()
+        try:
+            target = select(value, parent, *args)
+        except Exception:
+            instrumentation.record(None, 'select', instrumentation.clock() - start, error=True)
+            raise
+        instrumentation.record(target.schema, 'select', instrumentation.clock() - start)
+        return target
+
+    def _select_deserializer(self, value, parent, partial=None):
+        if self.instrumentation is not None:
+            return self._timed_select(self._pick_deserializer, value, parent, partial)
+        return self._pick_deserializer(value, parent, partial)
+
+    def _pick_deserializer(self, value, parent, partial=None):
+        # The selectors are not told about partial loads
+        deserializer = None
+        try:
+            deserializer = self.deserialization_schema_selector(value, parent)
+            return self._deserializer_target(deserializer)
+        except ValidationError:
+            raise
+        except Exception as err:
+            raise self._selector_error(err, value, deserializer) from err
+
+    def _deserializer_target(self, deserializer):
+        target = self._compile(deserializer)
+        if target.load is None:
+            raise Exception('Invalid deserializer type')
+        return target
+
+    @staticmethod
+    def _selector_error(err, value, deserializer):
+        if isinstance(err, TypeError):
+            return ValidationError(str(err), code=errors.SELECTOR_REJECTED)
+
+        class_type = None
+        if deserializer:
+            class_type = str(type(deserializer))
+
+        return ValidationError(
+            "Unable to use schema. Error: {err}\n"
+            "Ensure there is a deserialization_schema_selector"
+            " and then it returns a field or a schema when the function is passed in "
+            "{value_passed}. This is the class I got. "
+            "Make sure it is a field or a schema: {class_type}".format(
+                err=err,
+                value_passed=errors.preview(value),
+                class_type=class_type
+            ),
+            code=errors.SELECTOR_FAILED
+        )
+
+    def _resolve_serializer(self, value, obj):
+        memo = self._caches.serialization
+        if memo is None and self.instrumentation is None:
+            return self._pick_serializer(value, obj)
+        if memo is None:
+            return self._select_serializer(value, obj)
+        return self._memoized(
+            memo, self.serialization_fingerprint,
+            value, obj, self._select_serializer
+        )
 
-            # Will raise ValidationError if any problems
-            if isinstance(deserializer, Field):
-                data = deserializer.deserialize(v, attr, parent)
+    def _select_serializer(self, value, obj):
+        if self.instrumentation is not None:
+            return self._timed_select(self._pick_serializer, value, obj)
+        return self._pick_serializer(value, obj)
+
+    def _pick_serializer(self, value, obj):
+        return self._compile(self.serialization_schema_selector(value, obj))
+
+    def _call_context(self):
+        """The context of the current call, None when it is empty"""
+        # Older marshmallow releases fail on Field.context without a parent
+        context = getattr(self.parent, 'context', None)
+        if type(context) is _SchemaContext:
+            context = context.current
+        return context or None
+
+    def _context_propagator(self):
+        context = self._call_context()
+        if context is None:
+            return _no_context
+        return _ContextPropagator(context)
+
+    def make_error(self, key, **kwargs):
+        # The message key doubles as the stable error code
+        error = super().make_error(key, **kwargs)
+        error.kwargs['code'] = key
+        return error
+
+    def _compile_precheck(self):
+        """
+        Returns the function checking one element for precheck=True: it
+        has to be a mapping holding the required keys of a candidate schema
+        """
+        if self.candidate_schemas is None:
+            raise ValueError('precheck=True needs candidate_schemas')
+        requirements = []
+        for schema in self.candidate_schemas:
+            if isinstance(schema, type):
+                schema = schema()
+            if not isinstance(schema, Schema):
+                # A field may accept anything, there is nothing to check
+                return lambda value, partial: None
+            requirements.append(_required_keys(schema))
+        invalid = self.error_messages['invalid']
+        missing_keys = self.error_messages['missing_keys']
+
+        def check(value, partial):
+            if not isinstance(value, Mapping):
+                return invalid
+            if partial:
+                return None
+            keys = value.keys()
+            for required in requirements:
+                if required <= keys:
+                    return None
+            return missing_keys
+        return check
+
+    def _run_precheck(self, value, partial):
+        """
+        Raises a ValidationError before anything is loaded when value, or
+        an element of it with many, fails the precheck
+        """
+        check = self._precheck
+        if check is None:
+            if callable(self.precheck):
+                custom = self.precheck
+
+                def check(value, partial):
+                    return custom(value)
             else:
-                deserializer.context.update(getattr(self, 'context', {}))
-                data = deserializer.load(v, partial=partial)
+                check = self._compile_precheck()
+            self._precheck = check
+        if not self.many:
+            message = check(value, partial)
+            if message is not None:
+                raise ValidationError(message)
+            return
+        if not isinstance(value, (list, tuple)):
+            raise self.make_error('invalid_list')
+        budget = self.error_budget
+        errors = {}
+        for index, v in enumerate(value):
+            message = check(v, partial)
+            if message is not None:
+                errors[index] = [message]
+                if budget is not None and len(errors) >= budget:
+                    break
+        if errors:
+            raise ValidationError(errors)
 
-            results.append(data)
+    def _deserialize(self, value, attr, parent, partial=None, **kwargs):
+        if type(value) is _Preloaded:
+            return value.value
+        if self.precheck:
+            self._run_precheck(value, partial)
+        if self.lazy:
+            return self._defer(value, attr, parent, partial)
+        if self.many:
+            return self._deserialize_many(value, attr, parent, partial)
+        with self._context_propagator() as propagate:
+            return self._load_one(value, attr, parent, partial, propagate)
 
+    def _defer(self, value, attr, parent, partial):
+        context = self._call_context()
         if self.many:
-            return results
-        else:
-            # Will be at least one otherwise value would have been None
-            return results[0]
+            return [LazyPolyValue(self, v, attr, parent, partial, context) for v in value]
+        return LazyPolyValue(self, value, attr, parent, partial, context)
+
+    def _deserialize_many(self, value, attr, parent, partial):
+        if (self.executor is not None and isinstance(value, (list, tuple))
+                and len(value) >= self.parallel_threshold):
+            return parallel.deserialize(self, value, attr, parent, partial)
+        with self._context_propagator() as propagate:
+            if self.batch:
+                return self._deserialize_batch(value, attr, parent, partial, propagate)
+
+            results = []
+            errors = {}
+            for index, v in enumerate(value):
+                try:
+                    results.append(self._load_one(v, attr, parent, partial, propagate))
+                except ValidationError as err:
+                    if not self.collect_errors:
+                        raise
+                    errors[index] = err.messages
+
+        if errors:
+            raise ValidationError(errors, valid_data=results)
+        return results
+
+    def _load_lazy(self, value, attr, parent, partial, context):
+        with _ContextPropagator(context) if context else _no_context as propagate:
+            return self._load_one(value, attr, parent, partial, propagate)
+
+    def _load_chunk(self, values, attr, parent, context, partial):
+        """
+        Loads a chunk of a many=True list sent to a parallel worker. Returns
+        the loaded values, None for the failing ones, and the errors of the
+        failing ones keyed by their index in the chunk
+        """
+        results = []
+        errors = {}
+        with _ContextPropagator(context) if context else _no_context as propagate:
+            for index, v in enumerate(values):
+                try:
+                    results.append(self._load_one(v, attr, parent, partial, propagate))
+                except ValidationError as err:
+                    errors[index] = err.messages
+                    results.append(None)
+        return results, errors
+
+    def _load_one(self, value, attr, parent, partial, propagate):
+        if self.iterative:
+            return self._load_tree(value, attr, parent, partial, propagate)
+        # Will raise ValidationError if any problems
+        return self._resolve_deserializer(value, parent, partial).load(
+            value, attr, parent, partial, propagate
+        )
+
+    def _node(self, value, parent, partial):
+        """
+        Returns the schema or field picked for value and the function
+        loading it, load(value, attr, parent, partial, propagate)
+        """
+        target = self._resolve_deserializer(value, parent, partial)
+        return target.schema, target.load
+
+    def _children_of(self, schema):
+        """The (data key, field) pairs of the PolyFields schema loads"""
+        children = self._child_polyfields.get(schema)
+        if children is None:
+            # The raw values of a schema with pre_load hooks are not the ones
+            # it loads, it is left to load its children itself
+            children = [] if _has_pre_load(schema) else [
+                (field.data_key or name, field)
+                for name, field in schema.load_fields.items()
+                if isinstance(field, PolyFieldBase)
+            ]
+            self._child_polyfields.put(schema, children)
+        return children
+
+    def _load_tree(self, value, attr, parent, partial, propagate):
+        """
+        Loads value and the PolyField values nested in it without recursing.
+        The tree is walked with a stack, then the nodes are loaded in reverse
+        order of that walk so every child is loaded before its parent
+        """
+        root = _TreeNode(self, value, attr, parent, ())
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            try:
+                schema, node.load = node.field._node(node.value, node.parent, partial)
+            except ValidationError as err:
+                raise _error_at(node.path, err) from err
+            if not isinstance(schema, Schema) or not isinstance(node.value, Mapping):
+                continue
+            for key, field in self._children_of(schema):
+                raw = node.value.get(key)
+                if raw is None:
+                    continue
+                path = node.path + (key,)
+                if not field.many:
+                    children = [_TreeNode(field, raw, key, node.value, path)]
+                elif isinstance(raw, (list, tuple)):
+                    children = [
+                        _TreeNode(field, v, key, node.value, path + (index,))
+                        for index, v in enumerate(raw)
+                    ]
+                else:
+                    # Left to the field to reject
+                    continue
+                node.children.append((key, field.many, children))
+                stack.extend(children)
+
+        for node in reversed(order):
+            value = node.value
+            if node.children:
+                value = dict(value)
+                for key, many, children in node.children:
+                    value[key] = _Preloaded(
+                        [child.result for child in children] if many else children[0].result
+                    )
+            try:
+                node.result = node.load(value, node.attr, node.parent, partial, propagate)
+            except ValidationError as err:
+                raise _error_at(node.path, err) from err
+            node.children = None
+        return root.result
+
+    def _deserialize_batch(self, value, attr, parent, partial, propagate):
+        value = list(value)
+        errors = {}
+        groups = self._group_by_schema(
+            value,
+            lambda v: self._resolve_deserializer(v, parent, partial),
+            errors if self.collect_errors else None
+        )
+        results = [None] * len(value)
+        for target, indices, values in groups:
+            loaded = None
+            if target.load_many is not None:
+                try:
+                    loaded = target.load_many(values, attr, parent, partial, propagate)
+                except ValidationError as err:
+                    if not self.collect_errors:
+                        raise ValidationError(
+                            self._scatter_messages(err.messages, indices)
+                        ) from err
+            if loaded is None:
+                # Custom fields, and groups that failed, go one by one so the
+                # good elements can be told apart from the bad ones
+                loaded = []
+                for index, v in zip(indices, values):
+                    try:
+                        loaded.append(target.load(v, attr, parent, partial, propagate))
+                    except ValidationError as err:
+                        if not self.collect_errors:
+                            raise ValidationError({index: err.messages}) from err
+                        errors[index] = err.messages
+                        loaded.append(None)
+            for index, data in zip(indices, loaded):
+                results[index] = data
+
+        if errors:
+            raise ValidationError(
+                dict(sorted(errors.items())),
+                valid_data=[data for index, data in enumerate(results) if index not in errors]
+            )
+        return results
 
     def _serialize(self, value, key, obj, **kwargs):
         if value is None:
             return None
         try:
-            if self.many:
-                res = []
-                for v in value:
-                    schema = self.serialization_schema_selector(v, obj)
-                    if isinstance(schema, type):
-                        schema = schema()
-                    with contextlib.suppress(AttributeError, TypeError):
-                        schema.context.update(getattr(self, 'context', {}))
-                    serialized = (schema.dump(v)
-                                  if hasattr(schema, 'dump')
-                                  else schema._serialize(v, None, None))
-                    res.append(serialized)
-                return res
-            else:
-                schema = self.serialization_schema_selector(value, obj)
-                if isinstance(schema, type):
-                    schema = schema()
-                with contextlib.suppress(AttributeError, TypeError):
-                    schema.context.update(getattr(self, 'context', {}))
-                return (schema.dump(value)
-                        if hasattr(schema, 'dump')
-                        else schema._serialize(value, None, None))
+            with self._context_propagator() as propagate:
+                if self.many:
+                    return self._serialize_many(value, obj, propagate)
+                return self._dump_one(value, obj, propagate)
         except Exception as err:
-            raise TypeError(
-                'Failed to serialize object. Error: {0}\n'
-                ' Ensure the serialization_schema_selector exists and '
-                ' returns a Schema and that schema'
-                ' can serialize this value {1}'.format(err, value))
+            raise self._serialization_error(err, value) from err
+
+    def _serialize_many(self, value, obj, propagate):
+        if self.columnar:
+            return self._serialize_columns(value, obj, propagate)
+        if self.batch:
+            return self._serialize_batch(value, obj, propagate)
+        return [self._dump_one(v, obj, propagate) for v in value]
+
+    def _serialize_columns(self, value, obj, propagate):
+        return self._dump_columns(
+            ((v, self._resolve_serializer(v, obj)) for v in value), propagate
+        )
+
+    def _dump_columns(self, pairs, propagate):
+        """Dumps the (value, target) pairs into one table per schema"""
+        # Keyed by class, so instances of one schema share a table and
+        # classes sharing a name are caught
+        tables = {}
+        names = {}
+        typed = self.columnar_arrays
+        name_resolver = self.columnar_name_resolver or columnar.table_name
+        for v, target in pairs:
+            schema_class = type(target.schema)
+            table = tables.get(schema_class)
+            if table is None:
+                name = name_resolver(schema_class)
+                other = names.setdefault(name, schema_class)
+                if other is not schema_class:
+                    raise ValueError(
+                        'Columnar tables of {0!r} and {1!r} are both named {2!r}, pass a'
+                        ' columnar_name_resolver'.format(other, schema_class, name)
+                    )
+                table = tables[schema_class] = columnar.Table(typed)
+            table.append(target.dump(v, propagate))
+        return {name: tables[schema_class].columns for name, schema_class in names.items()}
+
+    def _dump_cache_for(self, propagate):
+        """The dump cache to use in a call, None when it does not apply"""
+        # The output may depend on the context, which the key does not hold
+        if propagate is not _no_context:
+            return None
+        return self._dump_cache
+
+    def _dump_one(self, value, obj, propagate):
+        dump_cache = self._dump_cache_for(propagate)
+        if dump_cache is None:
+            return self._resolve_serializer(value, obj).dump(value, propagate)
+        data = dump_cache.get(value, _NOT_CACHED)
+        if data is _NOT_CACHED:
+            data = self._resolve_serializer(value, obj).dump(value, propagate)
+            dump_cache.put(value, data)
+        return data
+
+    def invalidate_dump(self, value=None):
+        """
+        Drops value from the dump cache so its next dump is computed again.
+        Without a value the whole cache is cleared
+        """
+        if self._dump_cache is None:
+            return
+        if value is None:
+            self._dump_cache.clear()
+        else:
+            self._dump_cache.invalidate(value)
+
+    @staticmethod
+    def _serialization_error(err, value):
+        return errors.SerializationError(err, value)
+
+    async def async_deserialize(self, value, attr=None, data=None, partial=None):
+        """
+        Coroutine counterpart of deserialize. The selectors may be regular
+        functions or coroutine functions
+        """
+        self._validate_missing(value)
+        if value is missing:
+            load_default = _load_default(self)
+            return load_default() if callable(load_default) else load_default
+        if self.allow_none and value is None:
+            return None
+        if self.precheck:
+            self._run_precheck(value, partial)
+        if self.lazy:
+            output = self._defer(value, attr, data, partial)
+        else:
+            output = await aio.deserialize(self, value, attr, data, partial)
+        self._validate(output)
+        return output
+
+    async def async_serialize(self, attr, obj, accessor=None):
+        """
+        Coroutine counterpart of serialize. The selectors may be regular
+        functions or coroutine functions
+        """
+        value = self.get_value(obj, attr, accessor=accessor)
+        if value is missing:
+            dump_default = _dump_default(self)
+            value = dump_default() if callable(dump_default) else dump_default
+        if value is missing:
+            return value
+        return await aio.serialize(self, value, obj)
+
+    async def _async_resolve_deserializer(self, value, parent, partial=None):
+        """Coroutine counterpart of _resolve_deserializer"""
+        return await aio.resolve_deserializer(self, value, parent)
+
+    async def _async_resolve_serializer(self, value, obj):
+        """Coroutine counterpart of _resolve_serializer"""
+        return await aio.resolve_serializer(self, value, obj)
+
+    def iter_deserialize(self, values, parent=None, attr=None, partial=None):
+        """
+        Lazily loads an iterable of values one at a time, the way a many field
+        would. Yields an ItemResult per value. Errors do not stop the stream,
+        they are reported in the errors of the element that failed
+
+        :param values: Any iterable, it is consumed lazily
+        :param parent: The parent data passed to the selector
+        """
+        propagate = self._context_propagator()
+        for index, value in enumerate(values):
+            try:
+                # Scoped per element, other code may run between two yields
+                with propagate:
+                    data = self._load_one(value, attr, parent, partial, propagate)
+            except ValidationError as err:
+                yield ItemResult(index, None, err.messages)
+            else:
+                yield ItemResult(index, data, None)
+
+    def iter_serialize(self, values, obj=None):
+        """
+        Lazily dumps an iterable of objects one at a time, the way a many field
+        would. Yields an ItemResult per object, with the error message in
+        errors when an object cannot be serialized
+
+        :param values: Any iterable, it is consumed lazily
+        :param obj: The parent object passed to the selector
+        """
+        propagate = self._context_propagator()
+        for index, value in enumerate(values):
+            try:
+                with propagate:
+                    data = self._dump_one(value, obj, propagate)
+            except Exception as err:
+                yield ItemResult(index, None, [str(self._serialization_error(err, value))])
+            else:
+                yield ItemResult(index, data, None)
+
+    def _serialize_batch(self, value, obj, propagate):
+        groups = self._group_by_schema(value, lambda v: self._resolve_serializer(v, obj))
+        res = [None] * sum(len(indices) for _, indices, _ in groups)
+        for target, indices, values in groups:
+            dumped = target.dump_many(values, propagate)
+            for index, data in zip(indices, dumped):
+                res[index] = data
+        return res
+
+    @staticmethod
+    def _group_by_schema(value, resolve, errors=None):
+        """
+        Runs resolve over every element and groups the elements by the schema
+        and tag of the target it returned. Returns (target, indices, values) triples in the
+        order each schema was first seen. When an errors dict is passed,
+        elements that fail to resolve are recorded there and skipped
+        """
+        groups = {}
+        for index, v in enumerate(value):
+            try:
+                target = resolve(v)
+            except ValidationError as err:
+                if errors is None:
+                    raise
+                errors[index] = err.messages
+                continue
+            key = (id(target.schema), target.tag)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (target, [], [])
+            group[1].append(index)
+            group[2].append(v)
+        return list(groups.values())
+
+    @staticmethod
+    def _scatter_messages(messages, indices):
+        return {
+            indices[key] if isinstance(key, int) else key: error
+            for key, error in messages.items()
+        }
 
     @abc.abstractmethod
     def serialization_schema_selector(self, value, obj):
@@ -123,13 +1314,292 @@ class PolyField(PolyFieldBase):
         an a dict representing that object, dict representing it's parent dict
         and returns the appropriate schema
 
+        Other options, such as batch or collect_errors, are the ones of
+        PolyFieldBase
+
         """
         super().__init__(many=many, **metadata)
         self._serialization_schema_selector_arg = serialization_schema_selector
         self._deserialization_schema_selector_arg = deserialization_schema_selector
 
+    @classmethod
+    def from_registry(cls, registry, deserialization_schema_selector=None, **metadata):
+        """
+        Builds a PolyField that serializes with the schemas of a SchemaRegistry
+
+        :param registry: SchemaRegistry mapping model classes to schemas
+        :param deserialization_schema_selector: Selector used when loading
+        """
+        return cls(
+            serialization_schema_selector=registry.serialization_schema_selector,
+            deserialization_schema_selector=deserialization_schema_selector,
+            **metadata
+        )
+
     def serialization_schema_selector(self, value, obj):
         return self._serialization_schema_selector_arg(value, obj)
 
     def deserialization_schema_selector(self, value, obj):
         return self._deserialization_schema_selector_arg(value, obj)
+
+
+class DiscriminatedPolyField(PolyFieldBase):
+    """
+    A PolyField that picks the schema to use from a discriminator key
+    rather than a selector function. The dispatch tables are built once
+    when the field is constructed so each element costs one dict lookup.
+    The options of PolyFieldBase all apply, except that the tag lookup is
+    never memoized when loading
+    """
+    default_error_messages = {
+        'invalid': 'Invalid input type. Expected a mapping.',
+        'missing_type': 'Missing discriminator "{discriminator}".',
+        'unknown_type': 'Unknown value for discriminator "{discriminator}": {tag}.',
+        'missing_tag_keys': 'Missing keys required for {tag!r}: {keys!r}.',
+    }
+
+    def __init__(
+            self,
+            discriminator='type',
+            mapping=None,
+            class_mapping=None,
+            many=False,
+            **metadata
+    ):
+        """
+        :param discriminator: Key that holds the type tag in the serialized data
+        :param mapping: Dict mapping each type tag to the schema or field
+        (class or instance) used for it
+        :param class_mapping: Dict mapping object classes to their type tag.
+        Used to pick the schema when serializing
+
+        candidate_schemas defaults to the schemas of mapping
+
+        """
+        super().__init__(many=many, **metadata)
+        self.discriminator = discriminator
+        self._tag_to_schema = {}
+        # Whether the tag has to be removed before loading / added after dumping
+        self._strip_tag = {}
+        self._emit_tag = {}
+        for tag, schema in (mapping or {}).items():
+            if isinstance(schema, type):
+                schema = schema()
+            if not isinstance(schema, (Field, Schema)):
+                raise ValueError(
+                    'Mapping for {0!r} must be a field or a schema'.format(tag)
+                )
+            is_schema = isinstance(schema, Schema)
+            self._tag_to_schema[tag] = schema
+            self._strip_tag[tag] = is_schema and discriminator not in schema.load_fields
+            self._emit_tag[tag] = is_schema and discriminator not in schema.dump_fields
+        self._class_to_tag = dict(class_mapping or {})
+        self._tag_targets = {}
+        unknown = set(self._class_to_tag.values()) - set(self._tag_to_schema)
+        if unknown:
+            raise ValueError(
+                'class_mapping refers to unknown tags: {0!r}'.format(sorted(unknown, key=str))
+            )
+        if self.candidate_schemas is None:
+            self.candidate_schemas = tuple(self._tag_to_schema.values())
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['_tag_targets'] = {}
+        return state
+
+    def serialization_schema_selector(self, value, obj):
+        return self._tag_to_schema[self._class_to_tag[type(value)]]
+
+    def warm_up(self):
+        # The mapping is instantiated when the field is built
+        return list(self._tag_to_schema.values())
+
+    def _openapi_discriminator(self, name_resolver, ref_prefix):
+        mapping = {
+            tag: openapi.reference(schema, name_resolver, ref_prefix)['$ref']
+            for tag, schema in self._tag_to_schema.items()
+            if isinstance(schema, Schema)
+        }
+        return {'propertyName': self.discriminator, 'mapping': mapping}
+
+    def deserialization_schema_selector(self, value, obj):
+        return self._tag_to_schema[value[self.discriminator]]
+
+    def _compile_precheck(self):
+        discriminator = self.discriminator
+        required = {
+            tag: _required_keys(schema) if isinstance(schema, Schema) else frozenset()
+            for tag, schema in self._tag_to_schema.items()
+        }
+        messages = self.error_messages
+
+        def check(value, partial):
+            if not isinstance(value, Mapping):
+                return messages['invalid']
+            try:
+                tag = value[discriminator]
+            except KeyError:
+                return messages['missing_type'].format(discriminator=discriminator)
+            try:
+                keys = required[tag]
+            except (KeyError, TypeError):
+                return messages['unknown_type'].format(
+                    discriminator=discriminator, tag=errors.preview(tag)
+                )
+            if partial or keys <= value.keys():
+                return None
+            return messages['missing_tag_keys'].format(
+                tag=tag, keys=sorted(keys - value.keys(), key=str)
+            )
+        return check
+
+    def _resolve_deserializer(self, value, parent, partial=None):
+        # One dict lookup, cheaper than any fingerprint, and key sets do not
+        # tell tags apart, so it is never memoized
+        if self.instrumentation is None:
+            return self._pick_deserializer(value, parent)
+        return self._select_deserializer(value, parent)
+
+    def _pick_deserializer(self, value, parent, partial=None):
+        try:
+            tag = value[self.discriminator]
+        except KeyError:
+            raise self.make_error('missing_type', discriminator=self.discriminator)
+        except TypeError:
+            raise self.make_error('invalid')
+        try:
+            return self._tag_target(tag)
+        except (KeyError, TypeError):
+            raise self.make_error(
+                'unknown_type', discriminator=self.discriminator, tag=errors.preview(tag)
+            )
+
+    def _pick_serializer(self, value, obj):
+        try:
+            tag = self._class_to_tag[type(value)]
+        except KeyError:
+            raise TypeError(
+                'Failed to serialize object. No type tag is mapped'
+                ' for class {0}'.format(type(value).__name__)
+            )
+        return self._tag_target(tag)
+
+    async def _async_resolve_deserializer(self, value, parent, partial=None):
+        # The tag lookup has nothing to await
+        return self._resolve_deserializer(value, parent)
+
+    async def _async_resolve_serializer(self, value, obj):
+        return self._resolve_serializer(value, obj)
+
+    def _tag_target(self, tag):
+        """The _TaggedTarget of tag, built on first use"""
+        target = self._tag_targets.get(tag)
+        if target is None:
+            target = self._tag_targets[tag] = _TaggedTarget(
+                self._compile(self._tag_to_schema[tag]), self.discriminator, tag,
+                self._strip_tag[tag], self._emit_tag[tag]
+            )
+        return target
+
+
+class StructuralPolyField(PolyFieldBase):
+    """
+    A PolyField that picks the schema from the keys of the data, for
+    payloads that carry no type tag. The keys each candidate requires and
+    accepts are computed once, and the candidates matching each distinct
+    key set are remembered so a known shape costs one lookup. Only when
+    several candidates match are they tried until one validates
+    """
+    default_error_messages = {
+        'invalid': 'Invalid input type. Expected a mapping.',
+        'no_match': 'No schema accepts the keys {keys}.',
+        'ambiguous': 'The keys {keys} match several schemas: {schemas}.',
+    }
+
+    def __init__(
+            self,
+            candidates,
+            serialization_schema_selector=None,
+            signature_cache_size=1024,
+            many=False,
+            **metadata
+    ):
+        """
+        :param candidates: The schemas (class or instance) the data can match.
+        A schema that raises on unknown fields only matches data whose keys
+        it all declares
+        :param serialization_schema_selector: Function picking the schema to
+        dump an object with, as for PolyField
+        :param signature_cache_size: How many distinct key sets to remember
+        the matching candidates of
+
+        """
+        schemas = [schema() if isinstance(schema, type) else schema for schema in candidates]
+        for schema in schemas:
+            if not isinstance(schema, Schema):
+                raise ValueError('Candidate {0!r} must be a schema'.format(schema))
+        metadata.setdefault('candidate_schemas', schemas)
+        super().__init__(many=many, **metadata)
+        self._serialization_schema_selector_arg = serialization_schema_selector
+        self._signatures = []
+        for schema in schemas:
+            accepted = frozenset(
+                field.data_key or name for name, field in schema.load_fields.items()
+            )
+            self._signatures.append(
+                (schema, _required_keys(schema), accepted if schema.unknown == RAISE else None)
+            )
+        self._matches = LRUCache(signature_cache_size)
+
+    def serialization_schema_selector(self, value, obj):
+        if self._serialization_schema_selector_arg is None:
+            raise TypeError('StructuralPolyField needs a serialization_schema_selector to dump')
+        return self._serialization_schema_selector_arg(value, obj)
+
+    def deserialization_schema_selector(self, value, obj, partial=None):
+        """
+        Returns the candidate matching the keys of value. A partial load
+        does not need the required keys of the candidate
+        """
+        if not isinstance(value, Mapping):
+            raise self.make_error('invalid')
+        keys = frozenset(value)
+        signature = (keys, bool(partial))
+        matches = self._matches.get(signature)
+        if matches is None:
+            matches = self._match(keys, partial)
+            self._matches.put(signature, matches)
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            raise self.make_error('no_match', keys=errors.preview_keys(keys))
+        valid = [schema for schema in matches if not schema.validate(value, partial=partial)]
+        if len(valid) == 1:
+            return valid[0]
+        raise self.make_error(
+            'ambiguous',
+            keys=errors.preview_keys(keys),
+            schemas=', '.join(type(schema).__name__ for schema in valid or matches)
+        )
+
+    def _match(self, keys, partial):
+        return tuple(
+            schema for schema, required, accepted in self._signatures
+            if (partial or required <= keys) and (accepted is None or keys <= accepted)
+        )
+
+    def _resolve_deserializer(self, value, parent, partial=None):
+        # _matches already remembers the candidates of each key set
+        if self.instrumentation is None:
+            return self._pick_deserializer(value, parent, partial)
+        return self._select_deserializer(value, parent, partial)
+
+    def _pick_deserializer(self, value, parent, partial=None):
+        return self._deserializer_target(
+            self.deserialization_schema_selector(value, parent, partial)
+        )
+
+    async def _async_resolve_deserializer(self, value, parent, partial=None):
+        # Matching keys has nothing to await
+        return self._resolve_deserializer(value, parent, partial)
@@ -0,0 +1,62 @@
+class SchemaRegistry(object):
+    """
+    Maps model classes to the schema used to serialize them. Lookups walk
+    the MRO of the value's class so subclasses use the schema of their
+    closest registered base. The result is cached per concrete class
+    """
+    def __init__(self, mapping=None):
+        """
+        :param mapping: Optional dict of model class to schema (class or instance)
+        """
+        self._schemas = {}
+        self._resolved = {}
+        for model_class, schema in (mapping or {}).items():
+            self.register(model_class, schema)
+
+    def register(self, model_class, schema=None):
+        """
+        Registers schema for model_class. Without a schema it returns a
+        decorator for the schema class::
+
+            @registry.register(Rectangle)
+            class RectangleSchema(Schema):
+                ...
+        """
+        if schema is None:
+            def decorator(schema_class):
+                self.register(model_class, schema_class)
+                return schema_class
+            return decorator
+
+        self._schemas[model_class] = schema
+        self._resolved.clear()
+        return schema
+
+    def lookup(self, model_class):
+        """Returns the schema for model_class or raises a TypeError"""
+        try:
+            return self._resolved[model_class]
+        except KeyError:
+            pass
+        for base in model_class.__mro__:
+            if base in self._schemas:
+                schema = self._resolved[model_class] = self._schemas[base]
+                return schema
+        raise TypeError(
+            'No schema registered for {0} or any of its bases'.format(model_class.__name__)
+        )
+
+    def serialization_schema_selector(self, value, obj):
+        try:
+            return self._resolved[type(value)]
+        except KeyError:
+            return self.lookup(type(value))
+
+    def __contains__(self, model_class):
+        return model_class in self._schemas
+
+    def __iter__(self):
+        return iter(self._schemas)
+
+    def __len__(self):
+        return len(self._schemas)
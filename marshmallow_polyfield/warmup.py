@@ -0,0 +1,55 @@
+"""
+Warming of whole schemas. Every PolyField reachable from a schema, through
+nested schemas, containers and the targets of other PolyFields, builds its
+targets ahead of the first request
+"""
+import gc
+
+from marshmallow import Schema, fields
+
+from marshmallow_polyfield.polyfield import PolyFieldBase
+
+
+def _children(item):
+    if isinstance(item, Schema):
+        return list(item.fields.values())
+    if isinstance(item, PolyFieldBase):
+        return item.warm_up()
+    if isinstance(item, fields.Nested):
+        return [item.schema]
+    if isinstance(item, fields.List):
+        return [item.inner]
+    if isinstance(item, fields.Tuple):
+        return list(item.tuple_fields)
+    if isinstance(item, fields.Mapping):
+        return [field for field in (item.key_field, item.value_field) if field is not None]
+    return []
+
+
+def warm_up(schema, freeze=False):
+    """
+    Warms every PolyField reachable from schema and returns the schema
+    instance. Call it at process start or before forking.
+
+    :param schema: Schema class or instance
+    :param freeze: Move every object tracked by the garbage collector to
+    its permanent generation (gc.freeze) once warm, so collections in forked
+    workers do not touch, and copy, the pages shared with the parent.
+    Ignored before Python 3.7, which has no gc.freeze
+    """
+    if isinstance(schema, type):
+        schema = schema()
+    seen = set()
+    stack = [schema]
+    while stack:
+        item = stack.pop()
+        # Instances of one schema class share their PolyFields' caches,
+        # which also stops recursive schemas
+        key = type(item) if isinstance(item, Schema) else id(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        stack.extend(_children(item))
+    if freeze and hasattr(gc, 'freeze'):
+        gc.freeze()
+    return schema
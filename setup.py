@@ -23,7 +23,7 @@ setup(
     keywords=['serialization', 'rest', 'json', 'api', 'marshal',
               'marshalling', 'deserialization', 'validation', 'schema'],
     python_requires='>=3.5',
-    install_requires=['marshmallow>=3.0.0b10'],
+    install_requires=['marshmallow>=3.0.0'],
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: Apache Software License',
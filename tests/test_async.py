@@ -0,0 +1,217 @@
+import asyncio
+from collections import namedtuple
+
+from marshmallow import ValidationError
+from marshmallow.utils import missing
+import pytest
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+    shape_schema_serialization_disambiguation,
+)
+
+
+def run(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class SchemaRegistryClient(object):
+    """Local stand-in for a schema registry behind an async client"""
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def lookup(self, name):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return {'rectangle': RectangleSchema, 'triangle': TriangleSchema}[name]
+
+
+def make_field(client, **kwargs):
+    async def deserialization_selector(value, _):
+        return await client.lookup('triangle' if 'base' in value else 'rectangle')
+
+    async def serialization_selector(value, _):
+        return await client.lookup(type(value).__name__.lower())
+
+    return PolyField(
+        deserialization_schema_selector=deserialization_selector,
+        serialization_schema_selector=serialization_selector,
+        **kwargs
+    )
+
+
+def shapes(count):
+    return [
+        {'color': 'red', 'base': i, 'height': 1} if i % 2
+        else {'color': 'blue', 'length': i + 1, 'width': 1}
+        for i in range(count)
+    ]
+
+
+def test_async_deserialize_many():
+    client = SchemaRegistryClient()
+    field = make_field(client, many=True, async_concurrency=8)
+
+    data = run(field.async_deserialize(shapes(20)))
+
+    assert data[:2] == [Rectangle('blue', 1, 1), Triangle('red', 1, 1)]
+    assert len(data) == 20
+    assert client.calls == 20
+    assert 1 < client.max_in_flight <= 8
+
+
+def test_async_deserialize_single_and_none():
+    field = make_field(SchemaRegistryClient(), allow_none=True)
+
+    assert run(field.async_deserialize(shapes(1)[0])) == Rectangle('blue', 1, 1)
+    assert run(field.async_deserialize(None)) is None
+    assert run(field.async_deserialize(missing)) is missing
+
+
+def test_async_deserialize_sync_selector():
+    field = PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        many=True
+    )
+    assert run(field.async_deserialize(shapes(2))) == [
+        Rectangle('blue', 1, 1), Triangle('red', 1, 1)
+    ]
+
+
+def test_async_deserialize_errors():
+    field = PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        many=True,
+        collect_errors=True
+    )
+    values = shapes(3)
+    values[1] = {'color': 'red'}
+    values[2]['width'] = 'wide'
+
+    with pytest.raises(ValidationError) as excinfo:
+        run(field.async_deserialize(values))
+
+    assert excinfo.value.messages == {
+        1: ['Could not detect type. Did not have a base or a length. '
+            'Are you sure this is a shape?'],
+        2: {'width': ['Not a valid integer.']},
+    }
+    assert excinfo.value.valid_data == [Rectangle('blue', 1, 1)]
+
+
+def test_async_deserialize_precheck():
+    client = SchemaRegistryClient()
+    field = make_field(
+        client, many=True, precheck=True, candidate_schemas=[TriangleSchema, RectangleSchema]
+    )
+
+    with pytest.raises(ValidationError) as excinfo:
+        run(field.async_deserialize(shapes(2) + ['garbage']))
+    assert excinfo.value.messages == {2: ['Invalid input type. Expected a mapping.']}
+    assert client.calls == 0
+
+
+def test_async_deserialize_lazy():
+    calls = []
+
+    def selector(value, parent):
+        calls.append(1)
+        return shape_schema_deserialization_disambiguation(value, parent)
+
+    field = PolyField(deserialization_schema_selector=selector, many=True, lazy=True)
+
+    data = run(field.async_deserialize(shapes(2)))
+    assert calls == []
+    assert [value.resolve() for value in data] == [Rectangle('blue', 1, 1), Triangle('red', 1, 1)]
+    assert calls == [1, 1]
+
+
+def test_async_deserialize_memoized():
+    client = SchemaRegistryClient()
+    field = make_field(client, many=True, memoize_selectors=True, async_concurrency=1)
+
+    run(field.async_deserialize(shapes(10)))
+    assert client.calls == 2
+
+
+def test_async_serialize():
+    client = SchemaRegistryClient()
+    field = make_field(client, many=True)
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+    stickers = StickerCollection([Rectangle('blue', 4, 10), Triangle('red', 1, 100)], 'x.png')
+
+    assert run(field.async_serialize('shapes', stickers)) == [
+        {'length': 4, 'width': 10, 'color': 'blue'},
+        {'base': 1, 'height': 100, 'color': 'red'},
+    ]
+
+
+def test_async_serialize_single_and_errors():
+    field = PolyField(serialization_schema_selector=shape_schema_serialization_disambiguation)
+    Sticker = namedtuple('Sticker', ['shape', 'image'])
+
+    assert run(field.async_serialize('shape', Sticker(Rectangle('blue', 4, 10), 'x'))) == {
+        'length': 4, 'width': 10, 'color': 'blue'
+    }
+    assert run(field.async_serialize('shape', Sticker(None, 'x'))) is None
+    assert run(field.async_serialize('missing', {})) is missing
+    with pytest.raises(TypeError):
+        run(field.async_serialize('shape', Sticker(3, 'x')))
+
+
+def test_async_discriminated():
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+        class_mapping={Rectangle: 'rectangle', Triangle: 'triangle'},
+        many=True,
+        collect_errors=True
+    )
+    values = [
+        {'type': 'rectangle', 'color': 'blue', 'length': 4, 'width': 10},
+        {'type': 'triangle', 'color': 'red', 'base': 1, 'height': 100},
+    ]
+    shapes = [Rectangle('blue', 4, 10), Triangle('red', 1, 100)]
+
+    assert run(field.async_deserialize(values)) == shapes
+    assert run(field.async_serialize('shapes', {'shapes': shapes})) == values
+    with pytest.raises(ValidationError) as excinfo:
+        run(field.async_deserialize(values + [{'type': 'circle'}]))
+    assert excinfo.value.messages == {
+        2: ["Unknown value for discriminator \"type\": 'circle'."]
+    }
+
+
+def test_async_serialize_columnar():
+    client = SchemaRegistryClient()
+    field = make_field(client, many=True, columnar=True, async_concurrency=1)
+    shapes = {'shapes': [Rectangle('blue', 4, 10), Triangle('red', 1, 100), Rectangle('a', 1, 2)]}
+
+    assert run(field.async_serialize('shapes', shapes)) == {
+        'RectangleSchema': {'length': [4, 1], 'width': [10, 2], 'color': ['blue', 'a']},
+        'TriangleSchema': {'base': [1], 'height': [100], 'color': ['red']},
+    }
+
+
+def test_async_serialize_dump_cache():
+    client = SchemaRegistryClient()
+    field = make_field(client, many=True, dump_cache_size=16)
+    shapes = {'shapes': [Rectangle('blue', 4, 10), Triangle('red', 1, 100)]}
+
+    first = run(field.async_serialize('shapes', shapes))
+    assert run(field.async_serialize('shapes', shapes)) == first
+    assert client.calls == 2
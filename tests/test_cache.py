@@ -0,0 +1,52 @@
+from marshmallow_polyfield.cache import DumpCache, LRUCache
+from marshmallow_polyfield.polyfield import key_set_fingerprint, type_fingerprint
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert list(cache) == ['a', 'c']
+    assert cache.get('b', 'default') == 'default'
+    assert cache.info() == {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2}
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2}
+
+
+class Node(object):
+    pass
+
+
+def test_dump_cache():
+    cache = DumpCache(2)
+    nodes = [Node() for _ in range(3)]
+    for i, node in enumerate(nodes):
+        cache.put(node, i)
+
+    assert len(cache) == 2
+    assert cache.get(nodes[0], 'default') == 'default'
+    assert cache.get(nodes[2]) == 2
+    assert cache.info() == {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2}
+
+    cache.invalidate(nodes[2])
+    assert cache.get(nodes[2]) is None
+
+
+def test_dump_cache_ignores_reused_ids():
+    cache = DumpCache(2)
+    node = Node()
+    cache.put(node, 'old')
+    cache._entries.put(id(node), (lambda: None, None, 'old'))
+    assert cache.get(node) is None
+
+
+def test_fingerprints():
+    assert key_set_fingerprint({'a': 1, 'b': 2}, None) == frozenset(['a', 'b'])
+    assert key_set_fingerprint('a@example.com', None) is str
+    assert type_fingerprint(1, None) is int
@@ -0,0 +1,33 @@
+from array import array
+
+from marshmallow_polyfield.columnar import Table
+
+
+def test_missing_columns_hold_none():
+    table = Table()
+    table.append({'a': 1})
+    table.append({'b': 2})
+    table.append({'a': 3, 'b': 4})
+    assert table.columns == {'a': [1, None, 3], 'b': [None, 2, 4]}
+    assert table.rows == 3
+
+
+def test_typed_columns():
+    table = Table(typed=True)
+    table.append({'int': 1, 'float': 1.5, 'str': 'a', 'bool': True, 'mixed': 1})
+    table.append({'int': 2, 'float': 2.5, 'str': 'b', 'bool': False, 'mixed': 2.5})
+    assert table.columns == {
+        'int': array('q', [1, 2]),
+        'float': array('d', [1.5, 2.5]),
+        'str': ['a', 'b'],
+        'bool': [True, False],
+        'mixed': [1, 2.5],
+    }
+    assert type(table.columns['mixed']) is list
+
+
+def test_typed_columns_fall_back_to_lists():
+    table = Table(typed=True)
+    table.append({'big': 1, 'gap': 1})
+    table.append({'big': 2 ** 70})
+    assert table.columns == {'big': [1, 2 ** 70], 'gap': [1, None]}
@@ -1,10 +1,19 @@
 from marshmallow import Schema, ValidationError, post_load, fields
-from marshmallow_polyfield.polyfield import PolyField, PolyFieldBase
+from marshmallow_polyfield import LazyPolyValue
+from marshmallow_polyfield.polyfield import (
+    DiscriminatedPolyField,
+    ItemResult,
+    PolyField,
+    PolyFieldBase,
+    _SchemaContext,
+)
 import pytest
 from tests.shapes import (
     Shape,
     Rectangle,
     Triangle,
+    RectangleSchema,
+    TriangleSchema,
     shape_schema_serialization_disambiguation,
     shape_property_schema_serialization_disambiguation,
     shape_schema_deserialization_disambiguation,
@@ -310,3 +319,695 @@ def test_deserialize_polyfield_partial_loading():
     assert PartialLoadingShapeSchema().load(data, partial=True) == data
     assert PartialLoadingShapeSchema(partial=True).load(data) == data
     assert PartialLoadingShapeSchema().load(data, partial=("shape.color", )) == data
+
+
+class TestDiscriminatedPolyField(object):
+
+    class ShapeListSchema(Schema):
+        main = DiscriminatedPolyField(
+            mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+            required=True
+        )
+        others = DiscriminatedPolyField(
+            mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+            allow_none=True,
+            many=True
+        )
+
+    def test_deserialize_discriminated(self):
+        data = self.ShapeListSchema().load(
+            {'main': {'type': 'rectangle', 'color': 'blue', 'length': 1, 'width': 100},
+             'others': [
+                 {'type': 'triangle', 'color': 'red', 'base': 8, 'height': 45},
+                 {'type': 'rectangle', 'color': 'pink', 'length': 4, 'width': 93}]}
+        )
+        assert data == {
+            'main': Rectangle('blue', 1, 100),
+            'others': [Triangle('red', 8, 45), Rectangle('pink', 4, 93)]
+        }
+
+    def test_deserialize_discriminated_does_not_mutate_input(self):
+        value = {'type': 'rectangle', 'color': 'blue', 'length': 1, 'width': 100}
+        self.ShapeListSchema().load({'main': value})
+        assert value['type'] == 'rectangle'
+
+    def test_deserialize_discriminated_keeps_declared_tag(self):
+
+        class TaggedSchema(Schema):
+            type = fields.Str()
+            name = fields.Str()
+
+        field = DiscriminatedPolyField(mapping={'tagged': TaggedSchema})
+        data = field.deserialize({'type': 'tagged', 'name': 'x'})
+        assert data == {'type': 'tagged', 'name': 'x'}
+
+    @pytest.mark.parametrize('value, message', [
+        ({'color': 'blue'}, 'Missing discriminator "type".'),
+        ({'type': 'circle'}, "Unknown value for discriminator \"type\": 'circle'."),
+        ({'type': ['circle']}, "Unknown value for discriminator \"type\": ['circle']."),
+        ('rectangle', 'Invalid input type. Expected a mapping.'),
+    ])
+    def test_deserialize_discriminated_errors(self, value, message):
+        with pytest.raises(ValidationError) as excinfo:
+            self.ShapeListSchema().load({'main': value})
+        assert excinfo.value.messages == {'main': [message]}
+
+    def test_deserialize_discriminated_schema_errors(self):
+        with pytest.raises(ValidationError) as excinfo:
+            self.ShapeListSchema().load(
+                {'main': {'type': 'rectangle', 'color': 'blue', 'length': 'four', 'width': 4}}
+            )
+        assert excinfo.value.messages == {'main': {'length': ['Not a valid integer.']}}
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_deserialize_discriminated_collect_errors(self, batch):
+        field = DiscriminatedPolyField(
+            mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+            many=True, collect_errors=True, batch=batch
+        )
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([
+                {'type': 'triangle', 'color': 'red', 'base': 8, 'height': 45},
+                {'type': 'circle'},
+                {'type': 'rectangle', 'color': 'pink', 'length': 'four', 'width': 93},
+                {'type': 'rectangle', 'color': 'pink', 'length': 4, 'width': 93},
+            ])
+        assert excinfo.value.messages == {
+            1: ["Unknown value for discriminator \"type\": 'circle'."],
+            2: {'length': ['Not a valid integer.']},
+        }
+        assert excinfo.value.valid_data == [Triangle('red', 8, 45), Rectangle('pink', 4, 93)]
+
+    def test_deserialize_discriminated_batch_shared_schema(self):
+        square = RectangleSchema()
+        field = DiscriminatedPolyField(
+            mapping={'rectangle': square, 'square': square},
+            class_mapping={Rectangle: 'rectangle'},
+            many=True, batch=True
+        )
+        values = [
+            {'type': 'square', 'color': 'red', 'length': 2, 'width': 2},
+            {'type': 'rectangle', 'color': 'blue', 'length': 1, 'width': 3},
+        ]
+        assert field.deserialize(values) == [Rectangle('red', 2, 2), Rectangle('blue', 1, 3)]
+
+    def test_deserialize_discriminated_lazy(self):
+        field = DiscriminatedPolyField(mapping={'rectangle': RectangleSchema}, lazy=True)
+        value = field.deserialize({'type': 'rectangle', 'color': 'blue', 'length': 1, 'width': 2})
+        assert isinstance(value, LazyPolyValue)
+        assert value.resolve() == Rectangle('blue', 1, 2)
+
+    def test_discriminated_invalid_mapping(self):
+        with pytest.raises(ValueError):
+            DiscriminatedPolyField(mapping={'rectangle': 1})
+        with pytest.raises(ValueError):
+            DiscriminatedPolyField(
+                mapping={'rectangle': RectangleSchema},
+                class_mapping={Triangle: 'triangle'}
+            )
+
+
+class TestSchemaInstanceCache(object):
+
+    @staticmethod
+    def counting_schema(counter):
+        class CountingSchema(Schema):
+            name = fields.Str()
+
+            def __init__(self, *args, **kwargs):
+                counter.append(1)
+                super().__init__(*args, **kwargs)
+
+        return CountingSchema
+
+    def test_schema_class_instantiated_once(self):
+        counter = []
+        schema_class = self.counting_schema(counter)
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: schema_class,
+            serialization_schema_selector=lambda _, __: schema_class,
+            many=True
+        )
+        values = [{'name': str(i)} for i in range(10)]
+
+        assert field.deserialize(values) == values
+        assert field.deserialize(values) == values
+        assert field.serialize('values', {'values': values}) == values
+        assert len(counter) == 1
+
+    def test_schema_cache_disabled(self):
+        counter = []
+        schema_class = self.counting_schema(counter)
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: schema_class,
+            many=True,
+            schema_cache_size=0
+        )
+        field.deserialize([{'name': 'a'}, {'name': 'b'}])
+        assert len(counter) == 2
+
+    def test_schema_cache_is_bounded(self):
+        counter = []
+        first, second = self.counting_schema(counter), self.counting_schema(counter)
+        field = PolyField(
+            deserialization_schema_selector=lambda v, _: first if v['name'] == 'a' else second,
+            many=True,
+            schema_cache_size=1
+        )
+        field.deserialize([{'name': 'a'}, {'name': 'a'}, {'name': 'b'}, {'name': 'a'}])
+        assert len(counter) == 3
+        assert list(field._caches.schemas) == [first]
+
+
+class TestBatchPolyField(object):
+
+    @staticmethod
+    def class_selector(value, _):
+        if isinstance(value, str):
+            return fields.Email
+        return TriangleSchema if 'base' in value else RectangleSchema
+
+    def test_batch_preserves_order(self):
+        field = PolyField(deserialization_schema_selector=self.class_selector,
+                          many=True, batch=True)
+        data = field.deserialize([
+            {'color': 'pink', 'length': 4, 'width': 93},
+            {'color': 'red', 'base': 8, 'height': 45},
+            'dummy@example.com',
+            {'color': 'blue', 'length': 1, 'width': 100},
+        ])
+        assert data == [
+            Rectangle('pink', 4, 93),
+            Triangle('red', 8, 45),
+            'dummy@example.com',
+            Rectangle('blue', 1, 100),
+        ]
+
+    def test_batch_loads_each_schema_once(self, monkeypatch):
+        calls = []
+        original_load = Schema.load
+
+        def load(schema, data, **kwargs):
+            calls.append((type(schema), kwargs.get('many')))
+            return original_load(schema, data, **kwargs)
+
+        monkeypatch.setattr(Schema, 'load', load)
+        field = PolyField(deserialization_schema_selector=self.class_selector,
+                          many=True, batch=True)
+        field.deserialize([{'color': 'red', 'base': i, 'height': 1} for i in range(5)] +
+                          [{'color': 'red', 'length': i, 'width': 1} for i in range(5)])
+        assert calls == [(TriangleSchema, True), (RectangleSchema, True)]
+
+    def test_batch_errors_use_original_index(self):
+        field = PolyField(deserialization_schema_selector=self.class_selector,
+                          many=True, batch=True)
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([
+                {'color': 'red', 'base': 8, 'height': 45},
+                {'color': 'pink', 'length': 4, 'width': 93},
+                {'color': 'red', 'base': 'eight', 'height': 45},
+            ])
+        assert excinfo.value.messages == {2: {'base': ['Not a valid integer.']}}
+
+    def test_batch_selector_error(self):
+        field = ShapePolyField(many=True, batch=True)
+        with pytest.raises(ValidationError, match='Could not detect type'):
+            field.deserialize([{'color': 'red'}])
+
+
+class TestCollectErrors(object):
+
+    values = [
+        {'color': 'pink', 'length': 4, 'width': 93},
+        {'color': 'red', 'base': 'eight', 'height': 45},
+        {'color': 'blue'},
+        'dummy@example.com',
+        'not an email',
+        {'color': 'red', 'base': 8, 'height': 45},
+    ]
+
+    expected_messages = {
+        1: {'base': ['Not a valid integer.']},
+        2: ['Could not detect type. Are you sure this is a shape or an email?'],
+        4: ['Not a valid email address.'],
+    }
+
+    expected_valid_data = [
+        Rectangle('pink', 4, 93),
+        'dummy@example.com',
+        Triangle('red', 8, 45),
+    ]
+
+    @staticmethod
+    def selector(value, _):
+        if isinstance(value, str):
+            return fields.Email
+        if 'base' in value:
+            return TriangleSchema
+        if 'length' in value:
+            return RectangleSchema
+        raise TypeError('Could not detect type. '
+                        'Are you sure this is a shape or an email?')
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_collect_errors(self, batch):
+        field = PolyField(deserialization_schema_selector=self.selector,
+                          many=True, batch=batch, collect_errors=True)
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize(self.values)
+
+        assert excinfo.value.messages == self.expected_messages
+        assert excinfo.value.valid_data == self.expected_valid_data
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_collect_errors_all_valid(self, batch):
+        field = PolyField(deserialization_schema_selector=self.selector,
+                          many=True, batch=batch, collect_errors=True)
+        assert field.deserialize([self.values[0], self.values[3]]) == [
+            Rectangle('pink', 4, 93), 'dummy@example.com'
+        ]
+
+    def test_collect_errors_in_schema(self):
+
+        class ShapesSchema(Schema):
+            shapes = PolyField(deserialization_schema_selector=self.selector,
+                               many=True, collect_errors=True)
+
+        with pytest.raises(ValidationError) as excinfo:
+            ShapesSchema().load({'shapes': self.values})
+
+        assert excinfo.value.messages == {'shapes': self.expected_messages}
+        assert excinfo.value.valid_data == {'shapes': self.expected_valid_data}
+
+    def test_batch_field_error_uses_original_index(self):
+        field = PolyField(deserialization_schema_selector=self.selector,
+                          many=True, batch=True)
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize(['dummy@example.com', 'not an email'])
+        assert excinfo.value.messages == {1: ['Not a valid email address.']}
+
+
+def test_iter_deserialize():
+    def values():
+        yield {'color': 'pink', 'length': 4, 'width': 93}
+        yield {'color': 'blue'}
+        yield {'color': 'red', 'base': 8, 'height': 45}
+
+    field = ShapePolyField(many=True)
+    results = field.iter_deserialize(values())
+
+    assert next(results) == ItemResult(0, Rectangle('pink', 4, 93), None)
+    assert next(results) == ItemResult(1, None, [
+        'Could not detect type. Did not have a base or a length. Are you sure this is a shape?'
+    ])
+    assert next(results) == ItemResult(2, Triangle('red', 8, 45), None)
+    with pytest.raises(StopIteration):
+        next(results)
+
+
+class TestMemoizedSelectors(object):
+
+    @staticmethod
+    def counting(selector, calls):
+        def wrapped(value, parent):
+            calls.append(value)
+            return selector(value, parent)
+        return wrapped
+
+    def test_memoized_deserialization(self):
+        calls = []
+        field = PolyField(
+            deserialization_schema_selector=self.counting(
+                shape_schema_deserialization_disambiguation, calls
+            ),
+            many=True,
+            memoize_selectors=True
+        )
+        values = [{'color': 'red', 'base': i, 'height': 1} for i in range(1, 6)]
+        values += [{'color': 'red', 'length': i, 'width': 1} for i in range(1, 6)]
+
+        data = field.deserialize(values)
+
+        assert data[0] == Triangle('red', 1, 1)
+        assert data[-1] == Rectangle('red', 5, 1)
+        assert len(calls) == 2
+        assert field.selector_cache_info()['deserialization'] == {
+            'hits': 8, 'misses': 2, 'size': 2, 'maxsize': 128
+        }
+
+    def test_memoized_errors_are_not_cached(self):
+        calls = []
+        field = PolyField(
+            deserialization_schema_selector=self.counting(
+                shape_schema_deserialization_disambiguation, calls
+            ),
+            memoize_selectors=True
+        )
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                field.deserialize({'color': 'blue'})
+        assert len(calls) == 2
+
+    def test_memoized_custom_fingerprint(self):
+        calls = []
+        field = PolyField(
+            deserialization_schema_selector=self.counting(
+                fuzzy_schema_deserialization_disambiguation, calls
+            ),
+            many=True,
+            memoize_selectors=True,
+            deserialization_fingerprint=lambda value, _: type(value)
+        )
+        data = field.deserialize([{'color': 'cyan'}, {'color': 'red'}, 'a@example.com'])
+
+        assert data == [Shape('cyan'), Shape('red'), 'a@example.com']
+        assert len(calls) == 2
+
+    def test_unhashable_fingerprint_skips_memo(self):
+        field = PolyField(
+            deserialization_schema_selector=fuzzy_schema_deserialization_disambiguation,
+            memoize_selectors=True,
+            deserialization_fingerprint=lambda value, _: value
+        )
+        assert field.deserialize({'color': 'cyan'}) == Shape('cyan')
+        assert field.selector_cache_info()['deserialization']['size'] == 0
+
+    def test_selector_cache_info_disabled(self):
+        assert ShapePolyField().selector_cache_info() is None
+
+
+class TestContextPropagation(object):
+
+    class ContextSchema(Schema):
+        name = fields.Str()
+
+        @post_load
+        def add_context(self, data, **_):
+            data['request'] = self.context.get('request')
+            return data
+
+    def test_context_reaches_target_schema(self):
+        target = self.ContextSchema()
+
+        class ParentSchema(Schema):
+            items = PolyField(deserialization_schema_selector=lambda _, __: target, many=True)
+            item = PolyField(deserialization_schema_selector=lambda _, __: target)
+
+        data = ParentSchema(context={'request': 7}).load(
+            {'items': [{'name': 'a'}, {'name': 'b'}], 'item': {'name': 'c'}}
+        )
+        assert data == {
+            'items': [{'name': 'a', 'request': 7}, {'name': 'b', 'request': 7}],
+            'item': {'name': 'c', 'request': 7},
+        }
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_context_installed_once_per_call(self, batch, monkeypatch):
+        swaps = []
+        swap = _SchemaContext.swap
+        monkeypatch.setattr(_SchemaContext, 'swap',
+                            lambda self, context: swaps.append(context) or swap(self, context))
+        target = self.ContextSchema()
+
+        class ParentSchema(Schema):
+            items = PolyField(deserialization_schema_selector=lambda _, __: target,
+                              many=True, batch=batch)
+
+        ParentSchema(context={'request': 7}).load({'items': [{'name': 'a'}] * 10})
+        assert swaps == [{'request': 7}]
+
+    def test_no_context_is_not_installed(self):
+        target = self.ContextSchema()
+        field = PolyField(deserialization_schema_selector=lambda _, __: target, many=True)
+
+        field.deserialize([{'name': 'a'}] * 10)
+        assert type(target.context) is dict
+
+    def test_context_does_not_leak_into_later_loads(self):
+        class ParentSchema(Schema):
+            item = PolyField(deserialization_schema_selector=lambda _, __: self.ContextSchema)
+
+        payload = {'item': {'name': 'a'}}
+        alice = ParentSchema(context={'request': 'alice'}).load(payload)
+        assert alice['item']['request'] == 'alice'
+        assert ParentSchema().load(payload)['item']['request'] is None
+        assert ParentSchema(context={'other': 1}).load(payload)['item']['request'] is None
+        assert ParentSchema(context={'request': 'bob'}).load(payload)['item']['request'] == 'bob'
+
+    @pytest.mark.parametrize('nested', ['instance', 'class'])
+    def test_nested_schemas_follow_the_call_context(self, nested):
+
+        class InnerSchema(Schema):
+            name = fields.Str()
+
+            @post_load
+            def add_context(self, data, **_):
+                data['request'] = self.context.get('request')
+                return data
+
+        class TargetSchema(Schema):
+            inner = fields.Nested(InnerSchema() if nested == 'instance' else InnerSchema)
+            items = fields.List(fields.Nested(InnerSchema))
+
+        class ParentSchema(Schema):
+            item = PolyField(deserialization_schema_selector=lambda _, __: TargetSchema)
+
+        def load(**kwargs):
+            data = ParentSchema(**kwargs).load(
+                {'item': {'inner': {'name': 'a'}, 'items': [{'name': 'b'}]}}
+            )['item']
+            return data['inner']['request'], data['items'][0]['request']
+
+        assert load() == (None, None)
+        assert load(context={'request': 'A'}) == ('A', 'A')
+        assert load(context={'request': 'B'}) == ('B', 'B')
+        assert load() == (None, None)
+        assert load(context={'request': 'C'}) == ('C', 'C')
+
+    def test_target_context_restored_after_call(self):
+        target = self.ContextSchema(context={'request': 'own', 'base': 1})
+        field = PolyField(deserialization_schema_selector=lambda _, __: target)
+
+        class ParentSchema(Schema):
+            item = field
+
+        data = ParentSchema(context={'request': 'call'}).load({'item': {'name': 'a'}})
+        assert data == {'item': {'name': 'a', 'request': 'call'}}
+        assert dict(target.context) == {'request': 'own', 'base': 1}
+
+
+def test_deserialize_polyfield_unhashable_selector_result():
+    field = PolyField(deserialization_schema_selector=lambda _, __: [RectangleSchema])
+    with pytest.raises(ValidationError, match='Invalid deserializer type'):
+        field.deserialize({'color': 'blue', 'length': 1, 'width': 100})
+
+
+def test_deserialize_polyfield_reuses_compiled_target():
+    field = PolyField(deserialization_schema_selector=lambda _, __: RectangleSchema, many=True)
+    field.deserialize([{'color': 'blue', 'length': 1, 'width': 100}] * 3)
+
+    assert field._caches.schemas.info()['misses'] == 1
+    assert field._caches.schemas.info()['hits'] == 2
+
+
+class TestPrecheck(object):
+
+    @staticmethod
+    def make_field(calls, **kwargs):
+        def selector(value, parent):
+            calls.append(1)
+            return shape_schema_deserialization_disambiguation(value, parent)
+
+        kwargs.setdefault('candidate_schemas', [TriangleSchema, RectangleSchema])
+        return PolyField(deserialization_schema_selector=selector, precheck=True, **kwargs)
+
+    def test_rejects_before_loading(self):
+        calls = []
+        field = self.make_field(calls, many=True)
+        data = [
+            {'color': 'blue', 'length': 1, 'width': 2},
+            'garbage',
+            {'color': 'red', 'base': 1},
+        ]
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize(data)
+        assert excinfo.value.messages == {
+            1: ['Invalid input type. Expected a mapping.'],
+            2: ['Missing the required keys of every candidate schema.'],
+        }
+        assert calls == []
+
+        assert field.deserialize(data[:1]) == [Rectangle('blue', 1, 2)]
+        assert calls == [1]
+
+    def test_error_budget(self):
+        field = self.make_field([], many=True, error_budget=2)
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([{}] * 100)
+        assert list(excinfo.value.messages) == [0, 1]
+
+    def test_single_and_partial(self):
+        field = self.make_field([])
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize({'color': 'red'})
+        assert excinfo.value.messages == ['Missing the required keys of every candidate schema.']
+        # Partial data only has to be a mapping
+        field._run_precheck({'length': 1}, partial=True)
+
+    def test_container_type(self):
+        field = self.make_field([], many=True)
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize({'color': 'blue', 'length': 1, 'width': 2})
+        assert excinfo.value.messages == ['Not a valid list.']
+
+    def test_custom_check(self):
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: fields.Int(),
+            precheck=lambda value: None if isinstance(value, int) else 'Expected an int.',
+            many=True
+        )
+        assert field.deserialize([1, 2]) == [1, 2]
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([1, 'a'])
+        assert excinfo.value.messages == {1: ['Expected an int.']}
+
+    def test_field_candidates_accept_anything(self):
+        calls = []
+        field = self.make_field(calls, candidate_schemas=[fields.Int, RectangleSchema])
+        with pytest.raises(ValidationError):
+            field.deserialize('garbage')
+        assert calls == [1]
+
+    def test_needs_candidates(self):
+        field = self.make_field([], candidate_schemas=None)
+        with pytest.raises(ValueError):
+            field.deserialize({})
+
+    def test_discriminated(self):
+        field = DiscriminatedPolyField(
+            mapping={'triangle': TriangleSchema, 'name': fields.Str},
+            precheck=True,
+            many=True
+        )
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([
+                {'type': 'triangle', 'base': 1, 'height': 2},
+                {'type': 'triangle', 'base': 1},
+                {'type': 'square'},
+                {'base': 1},
+                ['type'],
+                {'type': 'name'},
+            ])
+        assert excinfo.value.messages == {
+            1: ["Missing keys required for 'triangle': ['height']."],
+            2: ['Unknown value for discriminator "type": \'square\'.'],
+            3: ['Missing discriminator "type".'],
+            4: ['Invalid input type. Expected a mapping.'],
+        }
+
+
+def _positive(n):
+    if n <= 0:
+        raise ValidationError('Must be positive.')
+
+
+class TestFieldTargets(object):
+
+    class Upper(fields.String):
+        def deserialize(self, value, attr=None, data=None, **kwargs):
+            return super().deserialize(value, attr, data, **kwargs).upper()
+
+    def test_validators_run(self):
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: fields.Int(validate=_positive)
+        )
+        assert field.deserialize(1) == 1
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize(-1)
+        assert excinfo.value.messages == ['Must be positive.']
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize(None)
+        assert excinfo.value.messages == ['Field may not be null.']
+
+    def test_custom_deserialize_is_kept(self):
+        upper = self.Upper()
+        field = PolyField(deserialization_schema_selector=lambda _, __: upper, many=True,
+                          batch=True)
+        assert field.deserialize(['a', 'b']) == ['A', 'B']
+        assert field._caches.schemas.get(upper).load_many is None
+
+    def test_batch_validates_distinct_values_once(self):
+        calls = []
+
+        def positive(n):
+            calls.append(n)
+            _positive(n)
+
+        int_field = fields.Int(validate=positive)
+        field = PolyField(
+            deserialization_schema_selector=lambda value, _: (
+                fields.Email if isinstance(value, str) else int_field
+            ),
+            many=True,
+            batch=True
+        )
+        assert field.deserialize([1, 'a@example.com', 1, 2, 1]) == [
+            1, 'a@example.com', 1, 2, 1
+        ]
+        assert calls == [1, 2]
+
+        # The whole group of the failing type is reported
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([1, 'nope', -1, None, 'x', -1])
+        assert excinfo.value.messages == {
+            2: ['Must be positive.'],
+            3: ['Field may not be null.'],
+            5: ['Must be positive.'],
+        }
+        assert calls == [1, 2, 1, -1]
+
+        field.collect_errors = True
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([1, 'nope', -1])
+        assert excinfo.value.messages == {
+            1: ['Not a valid email address.'],
+            2: ['Must be positive.'],
+        }
+
+    def test_batch_unhashable_outputs(self):
+        list_field = fields.List(fields.Int(), validate=lambda items: _positive(2 - len(items)))
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: list_field,
+            many=True,
+            batch=True
+        )
+        assert field.deserialize([[1], [2]]) == [[1], [2]]
+        with pytest.raises(ValidationError) as excinfo:
+            field.deserialize([[1], [1, 2], ['a']])
+        assert excinfo.value.messages == {
+            1: ['Must be positive.'],
+            2: {0: ['Not a valid integer.']},
+        }
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_attr_and_parent_reach_field(self, batch):
+
+        class Prefixed(fields.String):
+            def _deserialize(self, value, attr, data, **kwargs):
+                return '{0}:{1}:{2}'.format(attr, data['prefix'], value)
+
+        class ParentSchema(Schema):
+            prefix = fields.Str()
+            items = PolyField(deserialization_schema_selector=lambda _, __: Prefixed,
+                              many=True, batch=batch)
+
+        data = ParentSchema().load({'prefix': 'p', 'items': ['a', 'b']})
+        assert data['items'] == ['items:p:a', 'items:p:b']
+
+    @pytest.mark.parametrize('batch', [False, True])
+    def test_none_elements(self, batch):
+        nullable = fields.Int(allow_none=True)
+        field = PolyField(
+            deserialization_schema_selector=lambda _, __: nullable, many=True, batch=batch
+        )
+        assert field.deserialize([1, None]) == [1, None]
@@ -0,0 +1,105 @@
+import pickle
+
+from marshmallow import ValidationError
+import pytest
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField, errors
+from tests.shapes import TriangleSchema
+
+
+class Loud(object):
+    reprs = 0
+
+    def __repr__(self):
+        Loud.reprs += 1
+        return 'Loud()'
+
+
+def test_preview_is_bounded():
+    value = {'key{0}'.format(i): ['x' * 10000] * 1000 for i in range(1000)}
+    assert len(errors.preview(value)) < 200
+    assert errors.preview({'a': 1}) == "{'a': 1}"
+
+
+class Unordered(object):
+    """Counts comparisons, previews must not sort"""
+    comparisons = 0
+
+    def __init__(self, n):
+        self.n = n
+
+    def __lt__(self, other):
+        Unordered.comparisons += 1
+        return self.n < other.n
+
+    def __repr__(self):
+        return 'U{0}'.format(self.n)
+
+
+def test_preview_does_not_sort():
+    items = [Unordered(i) for i in range(1000)]
+    assert errors.preview({item: 1 for item in items}) == '{U0: 1, U1: 1, U2: 1, U3: 1, ...}'
+    assert errors.preview(set(items)).count('U') == 4
+    assert errors.preview(frozenset(items)).startswith('frozenset({U')
+    assert errors.preview(set()) == 'set()'
+    assert Unordered.comparisons == 0
+
+
+def test_preview_keys():
+    assert errors.preview_keys(frozenset(['b', 'a'])) == "['a', 'b']"
+    assert errors.preview_keys(frozenset(str(i) for i in range(1000))).endswith(', ...]')
+
+
+def test_serialization_error_renders_lazily():
+    Loud.reprs = 0
+    field = PolyField(serialization_schema_selector=lambda _, __: None)
+    with pytest.raises(TypeError) as excinfo:
+        field.serialize('value', {'value': Loud()})
+    assert excinfo.value.code == errors.SERIALIZATION_FAILED
+    assert Loud.reprs == 0
+
+    assert str(excinfo.value).endswith('can serialize this value Loud()')
+    assert Loud.reprs == 1
+
+
+def test_serialization_error_keeps_value_out_of_args():
+    value = list(range(200000))
+    field = PolyField(serialization_schema_selector=lambda _, __: None, many=True)
+    with pytest.raises(TypeError) as excinfo:
+        field.serialize('value', {'value': value})
+    err = excinfo.value
+    assert err.value is value
+    assert len(repr(err)) < 200
+
+    restored = pickle.loads(pickle.dumps(err))
+    assert len(pickle.dumps(err)) < 1000
+    assert type(restored) is type(err)
+    assert restored.value is None
+    assert str(restored) == str(err)
+
+
+def test_selector_failure_shows_a_preview():
+    field = PolyField(deserialization_schema_selector=lambda _, __: 1)
+    value = {'data': 'x' * 100000}
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize(value)
+    assert excinfo.value.kwargs['code'] == errors.SELECTOR_FAILED
+    assert len(excinfo.value.messages[0]) < 500
+
+
+def test_selector_type_error_code():
+    def selector(value, parent):
+        raise TypeError('Not a shape')
+
+    with pytest.raises(ValidationError) as excinfo:
+        PolyField(deserialization_schema_selector=selector).deserialize({})
+    assert excinfo.value.messages == ['Not a shape']
+    assert excinfo.value.kwargs['code'] == errors.SELECTOR_REJECTED
+
+
+def test_field_errors_carry_their_key_as_code():
+    field = DiscriminatedPolyField(mapping={'triangle': TriangleSchema})
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize({'type': 't' * 100000})
+    assert excinfo.value.kwargs['code'] == 'unknown_type'
+    assert len(excinfo.value.messages[0]) < 200
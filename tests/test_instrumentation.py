@@ -0,0 +1,131 @@
+from collections import namedtuple
+
+from marshmallow import ValidationError
+import pytest
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField, PolyFieldStats
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+    shape_schema_serialization_disambiguation,
+)
+
+
+class TickingStats(PolyFieldStats):
+    """Stats whose clock advances by one second on every reading"""
+    def __init__(self, callback=None):
+        super().__init__(callback)
+        self.now = 0
+
+    def clock(self):
+        self.now += 1
+        return self.now
+
+
+def counters(**kwargs):
+    result = {
+        'selections': 0, 'selector_time': 0.0, 'loads': 0, 'load_time': 0.0,
+        'dumps': 0, 'dump_time': 0.0, 'errors': 0,
+    }
+    result.update(kwargs)
+    return result
+
+
+def make_field(stats, **kwargs):
+    return PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        serialization_schema_selector=shape_schema_serialization_disambiguation,
+        instrumentation=stats,
+        **kwargs
+    )
+
+
+def test_stats_load():
+    stats = TickingStats()
+    field = make_field(stats, many=True, collect_errors=True)
+
+    with pytest.raises(ValidationError):
+        field.deserialize([
+            {'color': 'red', 'base': 1, 'height': 1},
+            {'color': 'blue', 'length': 1, 'width': 1},
+            {'color': 'blue', 'length': 1, 'width': 'one'},
+        ])
+    with pytest.raises(ValidationError):
+        field.deserialize([{'color': 'blue'}])
+
+    assert stats.as_dict() == {
+        'TriangleSchema': counters(selections=1, selector_time=1, loads=1, load_time=1),
+        'RectangleSchema': counters(
+            selections=2, selector_time=2, loads=2, load_time=2, errors=1
+        ),
+        '<unresolved>': counters(selections=1, selector_time=1, errors=1),
+    }
+
+
+def test_stats_dump_and_flush():
+    flushed = []
+    stats = TickingStats(callback=flushed.append)
+    field = make_field(stats, many=True, batch=True)
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+    shapes = [Rectangle('blue', 1, 1), Rectangle('blue', 2, 1), Triangle('red', 1, 1)]
+
+    field.serialize('shapes', StickerCollection(shapes, 'x.png'))
+
+    # The selector builds a new schema per shape, so every shape is its own batch
+    expected = {
+        'RectangleSchema': counters(selections=2, selector_time=2, dumps=2, dump_time=2),
+        'TriangleSchema': counters(selections=1, selector_time=1, dumps=1, dump_time=1),
+    }
+    assert stats.flush() == expected
+    assert flushed == [expected]
+    assert stats.as_dict() == {}
+
+
+def test_stats_batch_load():
+    stats = TickingStats()
+    field = make_field(stats, many=True, batch=True, memoize_selectors=True)
+
+    field.deserialize([{'color': 'blue', 'length': i, 'width': 1} for i in range(1, 4)])
+
+    assert stats.as_dict() == {
+        'RectangleSchema': counters(selections=1, selector_time=1, loads=3, load_time=1),
+    }
+
+
+@pytest.mark.parametrize('collect_errors', [False, True])
+def test_stats_batch_load_errors(collect_errors):
+    stats = TickingStats()
+    field = make_field(stats, many=True, batch=True, memoize_selectors=True,
+                       collect_errors=collect_errors)
+    values = [{'color': 'blue', 'length': i, 'width': 1} for i in range(1, 5)]
+    values[1]['width'] = values[3]['width'] = 'one'
+
+    with pytest.raises(ValidationError):
+        field.deserialize(values)
+
+    if collect_errors:
+        # The failed group is loaded again value by value
+        expected = counters(selections=1, selector_time=1, loads=8, load_time=5, errors=4)
+    else:
+        expected = counters(selections=1, selector_time=1, loads=4, load_time=1, errors=2)
+    assert stats.as_dict() == {'RectangleSchema': expected}
+
+
+def test_stats_discriminated():
+    stats = TickingStats()
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+        many=True,
+        instrumentation=stats,
+    )
+    field.deserialize([
+        {'type': 'triangle', 'color': 'red', 'base': 1, 'height': 1},
+        {'type': 'rectangle', 'color': 'blue', 'length': 1, 'width': 1},
+    ])
+    assert stats.as_dict() == {
+        'TriangleSchema': counters(selections=1, selector_time=1, loads=1, load_time=1),
+        'RectangleSchema': counters(selections=1, selector_time=1, loads=1, load_time=1),
+    }
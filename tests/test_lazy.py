@@ -0,0 +1,98 @@
+import copy
+import pickle
+
+from marshmallow import Schema, ValidationError, fields
+import pytest
+
+from marshmallow_polyfield import LazyPolyValue, PolyField
+from tests.shapes import Rectangle, Triangle, shape_schema_deserialization_disambiguation
+
+
+def counting_selector(calls):
+    def selector(value, parent):
+        calls.append(value)
+        return shape_schema_deserialization_disambiguation(value, parent)
+    return selector
+
+
+class LazyShapesSchema(Schema):
+    main = PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        lazy=True
+    )
+    others = PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        many=True,
+        lazy=True
+    )
+    name = fields.Str()
+
+
+def test_lazy_values_load_on_access():
+    calls = []
+    field = PolyField(deserialization_schema_selector=counting_selector(calls), lazy=True)
+
+    value = field.deserialize({'color': 'blue', 'length': 1, 'width': 100})
+
+    assert isinstance(value, LazyPolyValue)
+    assert not value.resolved
+    assert calls == []
+    assert value.length == 1
+    assert value.resolved
+    assert value.width == 100
+    assert len(calls) == 1
+    assert value == Rectangle('blue', 1, 100)
+
+
+def test_lazy_many_in_schema():
+    data = LazyShapesSchema().load({
+        'main': {'color': 'blue', 'length': 1, 'width': 100},
+        'others': [{'color': 'red', 'base': 8, 'height': 45}, {'color': 'nope'}],
+        'name': 'stickers',
+    })
+
+    assert data['name'] == 'stickers'
+    assert data['main'].resolve() == Rectangle('blue', 1, 100)
+    first, second = data['others']
+    assert first == Triangle('red', 8, 45)
+    assert second.raw == {'color': 'nope'}
+    with pytest.raises(ValidationError, match='Could not detect type'):
+        second.resolve()
+
+
+def test_lazy_schema_errors_surface_at_resolve():
+    field = PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        lazy=True
+    )
+    value = field.deserialize({'color': 'blue', 'length': 1, 'width': 'wide'})
+
+    assert repr(value) == '<LazyPolyValue unresolved>'
+    with pytest.raises(ValidationError) as excinfo:
+        value.resolve()
+    assert excinfo.value.messages == {'width': ['Not a valid integer.']}
+
+
+def test_lazy_dict_results():
+    class PointSchema(Schema):
+        x = fields.Int()
+
+    field = PolyField(deserialization_schema_selector=lambda _, __: PointSchema, lazy=True)
+    value = field.deserialize({'x': '1'})
+
+    assert value['x'] == 1
+    assert repr(value) == "<LazyPolyValue {'x': 1}>"
+    assert value == field.deserialize({'x': 1})
+
+
+def test_lazy_copy_and_pickle():
+    value = LazyShapesSchema().load({'main': {'color': 'blue', 'length': 1, 'width': 100}})['main']
+
+    assert not hasattr(value, '_missing')
+    assert not value.resolved
+
+    for clone in (copy.copy(value), copy.deepcopy(value), pickle.loads(pickle.dumps(value))):
+        assert not clone.resolved
+        assert clone == Rectangle('blue', 1, 100)
+    assert not value.resolved
+    assert value.length == 1
@@ -0,0 +1,113 @@
+import pickle
+
+from marshmallow import fields
+import pytest
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+    shape_schema_serialization_disambiguation,
+)
+
+
+def make_field(**kwargs):
+    return PolyField(
+        serialization_schema_selector=shape_schema_serialization_disambiguation,
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        candidate_schemas=[TriangleSchema, RectangleSchema],
+        **kwargs
+    )
+
+
+def test_candidates_are_warmed():
+    field = PolyField(
+        deserialization_schema_selector=lambda _, __: RectangleSchema,
+        candidate_schemas=[TriangleSchema, RectangleSchema],
+    )
+    assert list(field._caches.schemas) == [TriangleSchema, RectangleSchema]
+    warmed = field._caches.schemas.get(RectangleSchema)
+
+    field.deserialize({'color': 'blue', 'length': 1, 'width': 2})
+    assert list(field._caches.schemas) == [TriangleSchema, RectangleSchema]
+    assert field._caches.schemas.get(RectangleSchema) is warmed
+
+
+def test_unpickled_field_is_warmed():
+    field = pickle.loads(pickle.dumps(make_field()))
+    assert list(field._caches.schemas) == [TriangleSchema, RectangleSchema]
+
+
+def test_one_of():
+    assert make_field().openapi_schema() == {
+        'oneOf': [
+            {'$ref': '#/components/schemas/TriangleSchema'},
+            {'$ref': '#/components/schemas/RectangleSchema'},
+        ]
+    }
+
+
+def test_one_of_many_nullable_with_resolver():
+    field = make_field(many=True, allow_none=True)
+    spec = field.openapi_schema(
+        schema_name_resolver=lambda cls: cls.__name__[:-len('Schema')],
+        ref_prefix='#/definitions/'
+    )
+    assert spec == {
+        'type': 'array',
+        'items': {
+            'oneOf': [
+                {'$ref': '#/definitions/Triangle'},
+                {'$ref': '#/definitions/Rectangle'},
+            ]
+        },
+        'nullable': True,
+    }
+
+
+def test_field_candidates():
+    field = PolyField(
+        deserialization_schema_selector=lambda _, __: fields.Str(),
+        candidate_schemas=[fields.Str, fields.Int(), fields.Float, fields.Bool,
+                           fields.List(fields.Str()), fields.Dict, fields.Raw, fields.Email],
+    )
+    assert field.openapi_schema() == {
+        'oneOf': [
+            {'type': 'string'},
+            {'type': 'integer'},
+            {'type': 'number'},
+            {'type': 'boolean'},
+            {'type': 'array'},
+            {'type': 'object'},
+            {},
+        ]
+    }
+
+
+def test_no_candidates():
+    with pytest.raises(ValueError):
+        PolyField(deserialization_schema_selector=lambda _, __: fields.Str()).openapi_schema()
+
+
+def test_discriminated():
+    field = DiscriminatedPolyField(
+        mapping={'triangle': TriangleSchema, 'rectangle': RectangleSchema(), 'name': fields.Str},
+        class_mapping={Triangle: 'triangle', Rectangle: 'rectangle'},
+    )
+    assert field.openapi_schema() == {
+        'oneOf': [
+            {'$ref': '#/components/schemas/TriangleSchema'},
+            {'$ref': '#/components/schemas/RectangleSchema'},
+            {'type': 'string'},
+        ],
+        'discriminator': {
+            'propertyName': 'type',
+            'mapping': {
+                'triangle': '#/components/schemas/TriangleSchema',
+                'rectangle': '#/components/schemas/RectangleSchema',
+            },
+        },
+    }
@@ -0,0 +1,185 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+
+from marshmallow import Schema, ValidationError, fields, post_load
+import pytest
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField, parallel
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+)
+
+
+class RecordingExecutor(object):
+    """Runs everything in process and records the functions submitted"""
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append(fn.__name__)
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def clear_worker_fields():
+    yield
+    parallel._worker_fields.clear()
+
+
+def shapes(count):
+    return [
+        {'color': 'red', 'base': i, 'height': 1} if i % 2
+        else {'color': 'blue', 'length': i + 1, 'width': 1}
+        for i in range(count)
+    ]
+
+
+def expected_shapes(count):
+    return [
+        Triangle('red', i, 1) if i % 2 else Rectangle('blue', i + 1, 1)
+        for i in range(count)
+    ]
+
+
+def make_field(executor, **kwargs):
+    return PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        many=True,
+        executor=executor,
+        parallel_threshold=10,
+        parallel_chunk_size=7,
+        **kwargs
+    )
+
+
+def test_parallel_chunks_are_sent_once(monkeypatch):
+    unpickled = []
+    loads = parallel.pickle.loads
+    monkeypatch.setattr(parallel.pickle, 'loads', lambda data: unpickled.append(1) or loads(data))
+    executor = RecordingExecutor()
+    field = make_field(executor)
+
+    assert field.deserialize(shapes(30)) == expected_shapes(30)
+    assert executor.calls == ['load_chunk'] * 5
+    # The in process "worker" only unpickled the field for the first chunk
+    assert unpickled == [1]
+
+    assert field.deserialize(shapes(30)) == expected_shapes(30)
+    assert executor.calls == ['load_chunk'] * 10
+    assert unpickled == [1]
+
+
+def test_parallel_below_threshold_stays_in_process():
+    executor = RecordingExecutor()
+    field = make_field(executor)
+
+    assert field.deserialize(shapes(9)) == expected_shapes(9)
+    assert executor.calls == []
+
+
+@pytest.mark.parametrize('collect_errors', [False, True])
+def test_parallel_errors(collect_errors):
+    field = make_field(RecordingExecutor(), collect_errors=collect_errors)
+    values = shapes(30)
+    values[9] = {'color': 'blue'}
+    values[22] = {'color': 'red', 'base': 1, 'height': 'one'}
+
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize(values)
+
+    detect_error = ['Could not detect type. Did not have a base or a length. '
+                    'Are you sure this is a shape?']
+    if collect_errors:
+        assert excinfo.value.messages == {
+            9: detect_error,
+            22: {'height': ['Not a valid integer.']},
+        }
+        expected = expected_shapes(30)
+        assert excinfo.value.valid_data == expected[:9] + expected[10:22] + expected[23:]
+    else:
+        assert excinfo.value.messages == detect_error
+
+
+def test_parallel_process_pool():
+
+    class ShapesSchema(Schema):
+        shapes = make_field(None)
+
+    schema = ShapesSchema()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        schema.fields['shapes'].executor = executor
+        assert schema.load({'shapes': shapes(50)}) == {'shapes': expected_shapes(50)}
+
+
+def test_parallel_discriminated():
+    executor = RecordingExecutor()
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+        many=True,
+        executor=executor,
+        parallel_threshold=10,
+        parallel_chunk_size=7,
+    )
+    values = [
+        dict(value, type='triangle' if 'base' in value else 'rectangle') for value in shapes(30)
+    ]
+    assert field.deserialize(values) == expected_shapes(30)
+    assert executor.calls == ['load_chunk'] * 5
+
+
+class ProcessSchema(Schema):
+    """Records the process and the request of the call it was loaded in"""
+    name = fields.Str()
+
+    @post_load
+    def add_process(self, data, **_):
+        data['pid'] = os.getpid()
+        data['request'] = self.context.get('request')
+        return data
+
+
+def process_selector(value, parent):
+    return ProcessSchema
+
+
+class ProcessParentSchema(Schema):
+    items = PolyField(
+        deserialization_schema_selector=process_selector,
+        many=True,
+        parallel_threshold=10,
+        parallel_chunk_size=5,
+    )
+
+
+class OuterSchema(Schema):
+    # Loads ProcessParentSchema as a cached target, so its context is a proxy
+    inner = PolyField(deserialization_schema_selector=lambda _, __: ProcessParentSchema)
+
+
+@pytest.mark.parametrize('nested', [False, True])
+def test_parallel_process_pool_workers_and_context(nested):
+    values = [{'name': str(i)} for i in range(40)]
+    field = ProcessParentSchema._declared_fields['items']
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        field.executor = executor
+        try:
+            for request in ('A', 'B'):
+                if nested:
+                    items = OuterSchema(context={'request': request}).load(
+                        {'inner': {'items': values}}
+                    )['inner']['items']
+                else:
+                    items = ProcessParentSchema(context={'request': request}).load(
+                        {'items': values}
+                    )['items']
+                assert [item['name'] for item in items] == [str(i) for i in range(40)]
+                assert {item['request'] for item in items} == {request}
+                assert os.getpid() not in {item['pid'] for item in items}
+        finally:
+            field.executor = None
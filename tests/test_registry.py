@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+from marshmallow import Schema, fields
+import pytest
+
+from marshmallow_polyfield import PolyField, SchemaRegistry
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Shape,
+    ShapeSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+)
+
+
+class Square(Rectangle):
+    def __init__(self, color, length):
+        super().__init__(color, length, length)
+
+
+def test_registry_resolves_through_mro():
+    registry = SchemaRegistry({Shape: ShapeSchema, Rectangle: RectangleSchema})
+
+    assert registry.lookup(Rectangle) is RectangleSchema
+    assert registry.lookup(Square) is RectangleSchema
+    assert registry.lookup(Triangle) is ShapeSchema
+    with pytest.raises(TypeError):
+        registry.lookup(str)
+
+
+def test_registry_decorator():
+    registry = SchemaRegistry()
+
+    @registry.register(Square)
+    class SquareSchema(Schema):
+        length = fields.Int()
+
+    assert registry.lookup(Square) is SquareSchema
+    assert Square in registry
+    assert list(registry) == [Square]
+    assert len(registry) == 1
+
+
+def test_registry_register_invalidates_resolved():
+    registry = SchemaRegistry({Rectangle: RectangleSchema})
+    assert registry.lookup(Square) is RectangleSchema
+
+    registry.register(Square, ShapeSchema)
+    assert registry.lookup(Square) is ShapeSchema
+
+
+def test_polyfield_from_registry():
+    registry = SchemaRegistry({Rectangle: RectangleSchema, Triangle: TriangleSchema})
+    field = PolyField.from_registry(
+        registry,
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        many=True
+    )
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+    shapes = [Square('blue', 4), Triangle('red', 1, 100)]
+
+    serialized = field.serialize('shapes', StickerCollection(shapes, 'marshmallow.png'))
+
+    assert serialized == [
+        {'length': 4, 'width': 4, 'color': 'blue'},
+        {'base': 1, 'height': 100, 'color': 'red'},
+    ]
+    assert field.deserialize(serialized) == [Rectangle('blue', 4, 4), Triangle('red', 1, 100)]
+    with pytest.raises(TypeError):
+        field.serialize('shapes', StickerCollection(['square'], 'marshmallow.png'))
@@ -1,10 +1,13 @@
+from array import array
 from collections import namedtuple
 from marshmallow import fields, Schema
-from marshmallow_polyfield.polyfield import PolyField
+from marshmallow_polyfield.polyfield import DiscriminatedPolyField, ItemResult, PolyField
 import pytest
 from tests.shapes import (
     Rectangle,
     Triangle,
+    RectangleSchema,
+    TriangleSchema,
     shape_schema_serialization_disambiguation,
     shape_schema_deserialization_disambiguation,
     fuzzy_pos_schema_selector,
@@ -137,3 +140,302 @@ def test_serializing_polyfield_dict():
 
     data = FuzzyPosSchema().dump({'type': 'dict', 'data': positions})
     assert data == expected_data
+
+
+class Square(Rectangle):
+    pass
+
+
+def test_serializing_discriminated_polyfield():
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+        class_mapping={Rectangle: 'rectangle', Triangle: 'triangle'},
+        many=True
+    )
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+    stickers = StickerCollection(
+        [Rectangle("blue", 4, 10), Triangle("red", 1, 100)], "marshmallow.png"
+    )
+
+    assert field.serialize('shapes', stickers) == [
+        {"type": "rectangle", "length": 4, "width": 10, "color": "blue"},
+        {"type": "triangle", "base": 1, "height": 100, "color": "red"}
+    ]
+    assert field.deserialize(field.serialize('shapes', stickers)) == stickers.shapes
+
+
+def test_serializing_discriminated_polyfield_unknown_class():
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema},
+        class_mapping={Rectangle: 'rectangle'}
+    )
+    Sticker = namedtuple('Sticker', ['shape', 'image'])
+    with pytest.raises(TypeError):
+        field.serialize('shape', Sticker(Triangle("red", 1, 100), "marshmallow.png"))
+
+
+def test_discriminated_polyfield_field_target():
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'raw': fields.Dict()},
+        class_mapping={Rectangle: 'rectangle', dict: 'raw'}
+    )
+    raw = {'type': 'raw', 'x': 1}
+
+    assert field.deserialization_schema_selector(raw, None) is field._tag_to_schema['raw']
+    assert field.serialization_schema_selector(Rectangle("blue", 4, 10), None) is (
+        field._tag_to_schema['rectangle']
+    )
+    assert field.deserialize(raw) == raw
+    assert field.serialize('shape', {'shape': raw}) == raw
+
+
+@pytest.mark.parametrize('options', [
+    {'batch': True},
+    {'dump_cache_size': 16},
+    {'schema_cache_size': 0},
+])
+def test_serializing_discriminated_polyfield_options(options):
+    square = RectangleSchema()
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': square, 'triangle': TriangleSchema, 'square': square},
+        class_mapping={Rectangle: 'rectangle', Triangle: 'triangle', Square: 'square'},
+        many=True,
+        **options
+    )
+    shapes = [Rectangle("blue", 4, 10), Square("green", 2, 2), Triangle("red", 1, 100)]
+
+    expected = [
+        {"type": "rectangle", "length": 4, "width": 10, "color": "blue"},
+        {"type": "square", "length": 2, "width": 2, "color": "green"},
+        {"type": "triangle", "base": 1, "height": 100, "color": "red"},
+    ]
+    assert field.serialize('shapes', {'shapes': shapes}) == expected
+    assert field.serialize('shapes', {'shapes': shapes}) == expected
+
+
+def test_serializing_discriminated_polyfield_columnar():
+    field = DiscriminatedPolyField(
+        mapping={'rectangle': RectangleSchema, 'triangle': TriangleSchema},
+        class_mapping={Rectangle: 'rectangle', Triangle: 'triangle'},
+        many=True,
+        columnar=True
+    )
+    shapes = [Rectangle("blue", 4, 10), Triangle("red", 1, 100)]
+    assert field.serialize('shapes', {'shapes': shapes}) == {
+        'RectangleSchema': {
+            'type': ['rectangle'], 'length': [4], 'width': [10], 'color': ['blue']
+        },
+        'TriangleSchema': {'type': ['triangle'], 'base': [1], 'height': [100], 'color': ['red']},
+    }
+
+
+def test_serializing_polyfield_batch():
+    def selector(value, _):
+        return RectangleSchema if isinstance(value, Rectangle) else fields.Raw
+
+    field = PolyField(serialization_schema_selector=selector, many=True, batch=True)
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+    shapes = [Rectangle("blue", 4, 10), 'triangle', Rectangle("pink", 2, 3)]
+    serialized = field.serialize('shapes', StickerCollection(shapes, "marshmallow.png"))
+
+    assert serialized == [
+        {"length": 4, "width": 10, "color": "blue"},
+        'triangle',
+        {"length": 2, "width": 3, "color": "pink"},
+    ]
+
+
+@with_both_shapes
+def test_iter_serialize(field):
+    results = list(field.iter_serialize(iter([Rectangle("blue", 4, 10), 3])))
+
+    assert results[0] == ItemResult(0, {"length": 4, "width": 10, "color": "blue"}, None)
+    assert results[1].index == 1
+    assert results[1].data is None
+    assert 'Failed to serialize object' in results[1].errors[0]
+
+
+def test_serializing_memoized_polyfield():
+    calls = []
+
+    def selector(value, obj):
+        calls.append(value)
+        return shape_schema_serialization_disambiguation(value, obj)
+
+    field = PolyField(serialization_schema_selector=selector, many=True, memoize_selectors=True)
+    shapes = [Rectangle("blue", i, 10) for i in range(5)] + [Triangle("red", 1, 100)]
+    StickerCollection = namedtuple('StickerCollection', ['shapes', 'image'])
+
+    serialized = field.serialize('shapes', StickerCollection(shapes, "marshmallow.png"))
+
+    assert serialized[4] == {"length": 4, "width": 10, "color": "blue"}
+    assert serialized[5] == {"base": 1, "height": 100, "color": "red"}
+    assert len(calls) == 2
+    assert field.selector_cache_info()['serialization']['hits'] == 4
+
+
+def test_serializing_polyfield_context():
+    class ContextSchema(Schema):
+        name = fields.Method('get_name')
+
+        def get_name(self, obj):
+            return '{0}-{1}'.format(obj['name'], self.context['request'])
+
+    class ParentSchema(Schema):
+        items = PolyField(
+            serialization_schema_selector=lambda v, _: ContextSchema if 'name' in v else fields.Raw,
+            many=True
+        )
+
+    data = ParentSchema(context={'request': 7}).dump({'items': [{'name': 'a'}, {'other': 1}]})
+    assert data == {'items': [{'name': 'a-7'}, {'other': 1}]}
+
+
+class TestDumpCache(object):
+
+    @staticmethod
+    def make_field(calls, **kwargs):
+        def selector(value, obj):
+            calls.append(type(value))
+            return shape_schema_serialization_disambiguation(value, obj)
+
+        return PolyField(serialization_schema_selector=selector, dump_cache_size=16, **kwargs)
+
+    def test_cached_dump_skips_selector(self):
+        calls = []
+        field = self.make_field(calls)
+        rect = Rectangle("blue", 4, 10)
+
+        expected = {"length": 4, "width": 10, "color": "blue"}
+        assert field.serialize('shape', {'shape': rect}) == expected
+        assert field.serialize('shape', {'shape': rect}) == expected
+        assert len(calls) == 1
+
+    def test_invalidate_dump(self):
+        calls = []
+        field = self.make_field(calls)
+        rect = Rectangle("blue", 4, 10)
+        field.serialize('shape', {'shape': rect})
+
+        rect.length = 5
+        field.invalidate_dump(rect)
+        assert field.serialize('shape', {'shape': rect})['length'] == 5
+
+        rect.length = 6
+        field.invalidate_dump()
+        assert field.serialize('shape', {'shape': rect})['length'] == 6
+        assert len(calls) == 3
+
+    def test_version_key(self):
+        calls = []
+        field = self.make_field(calls, dump_cache_version=lambda shape: shape.length)
+        rect = Rectangle("blue", 4, 10)
+        field.serialize('shape', {'shape': rect})
+
+        rect.color = 'red'
+        assert field.serialize('shape', {'shape': rect})['color'] == 'blue'
+        rect.length = 5
+        expected = {"length": 5, "width": 10, "color": "red"}
+        assert field.serialize('shape', {'shape': rect}) == expected
+
+    def test_dump_cache_does_not_pin_objects(self):
+        calls = []
+        field = self.make_field(calls, many=True)
+        shapes = [Rectangle("blue", i, 10) for i in range(3)]
+        field.serialize('shapes', {'shapes': shapes})
+        assert len(field._dump_cache) == 3
+
+        del shapes
+        assert len(field._dump_cache) == 0
+
+    def test_values_without_weakrefs_are_not_cached(self):
+        field = PolyField(serialization_schema_selector=lambda _, __: fields.Raw,
+                          dump_cache_size=16)
+        assert field.serialize('data', {'data': {'x': 1}}) == {'x': 1}
+        assert len(field._dump_cache) == 0
+        field.invalidate_dump()
+
+    def test_context_bypasses_cache(self):
+        class ContextRectangleSchema(RectangleSchema):
+            unit = fields.Function(lambda _, context: context.get('unit'))
+
+        class DrawingSchema(Schema):
+            shape = PolyField(serialization_schema_selector=lambda _, __: ContextRectangleSchema,
+                              dump_cache_size=16)
+
+        drawing = {'shape': Rectangle("blue", 4, 10)}
+        assert DrawingSchema(context={'unit': 'cm'}).dump(drawing)['shape']['unit'] == 'cm'
+        assert DrawingSchema(context={'unit': 'in'}).dump(drawing)['shape']['unit'] == 'in'
+        assert DrawingSchema().dump(drawing)['shape']['unit'] is None
+        assert len(DrawingSchema().fields['shape']._dump_cache) == 1
+
+    def test_invalidate_without_cache(self):
+        field = PolyField(serialization_schema_selector=lambda _, __: fields.Raw)
+        field.invalidate_dump()
+
+
+class TestColumnar(object):
+
+    shapes = [
+        Rectangle('blue', 1, 2),
+        Triangle('red', 3, 4),
+        Rectangle('green', 5, 6),
+        7,
+    ]
+
+    @staticmethod
+    def selector(value, obj):
+        if isinstance(value, int):
+            return fields.Int
+        return shape_schema_serialization_disambiguation(value, obj)
+
+    def test_columns_per_schema(self):
+        field = PolyField(serialization_schema_selector=self.selector, many=True, columnar=True)
+        assert field.serialize('shapes', {'shapes': self.shapes}) == {
+            'RectangleSchema': {
+                'color': ['blue', 'green'], 'length': [1, 5], 'width': [2, 6]
+            },
+            'TriangleSchema': {'color': ['red'], 'base': [3], 'height': [4]},
+            'Integer': {'value': [7]},
+        }
+
+    def test_array_columns(self):
+        field = PolyField(
+            serialization_schema_selector=self.selector,
+            many=True,
+            columnar=True,
+            columnar_arrays=True
+        )
+        tables = field.serialize('shapes', {'shapes': self.shapes})
+        assert tables['RectangleSchema']['length'] == array('q', [1, 5])
+        assert tables['RectangleSchema']['color'] == ['blue', 'green']
+        assert tables['Integer']['value'] == array('q', [7])
+
+    def test_same_named_schemas_raise(self):
+        OtherRectangleSchema = type('RectangleSchema', (RectangleSchema,), {})
+        field = PolyField(
+            serialization_schema_selector=lambda value, _: (
+                OtherRectangleSchema if value.color == 'green' else RectangleSchema
+            ),
+            many=True,
+            columnar=True
+        )
+        shapes = [Rectangle('blue', 1, 2), Rectangle('green', 5, 6)]
+        with pytest.raises(TypeError, match='both named'):
+            field.serialize('shapes', {'shapes': shapes})
+
+        field.columnar_name_resolver = lambda schema_class: '{0}.{1}'.format(
+            schema_class.__module__, schema_class.__qualname__
+        )
+        tables = field.serialize('shapes', {'shapes': shapes})
+        assert sorted(table['color'] for table in tables.values()) == [['blue'], ['green']]
+
+    def test_instances_of_one_schema_share_a_table(self):
+        field = PolyField(serialization_schema_selector=self.selector, many=True, columnar=True,
+                          schema_cache_size=0)
+        tables = field.serialize('shapes', {'shapes': self.shapes})
+        assert tables['RectangleSchema']['color'] == ['blue', 'green']
+
+    def test_scalar_is_not_columnar(self):
+        field = PolyField(serialization_schema_selector=self.selector, columnar=True)
+        assert field.serialize('shape', {'shape': 7}) == 7
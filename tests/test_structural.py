@@ -0,0 +1,142 @@
+from marshmallow import EXCLUDE, Schema, ValidationError, fields
+import pytest
+
+from marshmallow_polyfield import StructuralPolyField
+from tests.shapes import (
+    Rectangle,
+    RectangleSchema,
+    Triangle,
+    TriangleSchema,
+    shape_schema_serialization_disambiguation,
+)
+
+
+class CircleSchema(Schema):
+    color = fields.Str()
+    radius = fields.Int(data_key='r', required=True)
+
+
+class LooseCircleSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    radius = fields.Int(data_key='r', required=True)
+
+
+class PositiveCircleSchema(Schema):
+    radius = fields.Int(data_key='r', required=True, validate=lambda r: r > 0)
+
+
+class NegativeCircleSchema(Schema):
+    radius = fields.Int(data_key='r', required=True, validate=lambda r: r < 0)
+
+
+def make_field(**kwargs):
+    return StructuralPolyField(
+        candidates=[TriangleSchema, RectangleSchema, CircleSchema()],
+        serialization_schema_selector=shape_schema_serialization_disambiguation,
+        **kwargs
+    )
+
+
+def test_picks_schema_from_keys():
+    field = make_field(many=True)
+    data = [
+        {'color': 'red', 'base': 1, 'height': 2},
+        {'color': 'blue', 'length': 3, 'width': 4},
+        {'length': 5, 'width': 6, 'color': None},
+        {'r': 7},
+    ]
+    assert field.deserialize(data) == [
+        Triangle('red', 1, 2),
+        Rectangle('blue', 3, 4),
+        Rectangle(None, 5, 6),
+        {'radius': 7},
+    ]
+    assert len(field._matches) == 3
+
+
+def test_no_match():
+    field = make_field()
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize({'color': 'red', 'base': 1})
+    assert excinfo.value.messages == ["No schema accepts the keys ['base', 'color']."]
+
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize({'r': 1, 'base': 1, 'height': 2})
+    assert excinfo.value.messages == ["No schema accepts the keys ['base', 'height', 'r']."]
+
+
+def test_invalid():
+    with pytest.raises(ValidationError) as excinfo:
+        make_field().deserialize(['base', 'height'])
+    assert excinfo.value.messages == ['Invalid input type. Expected a mapping.']
+
+
+def test_unknown_keys_allowed_by_schema():
+    field = StructuralPolyField(candidates=[TriangleSchema, LooseCircleSchema])
+    assert field.deserialize({'r': 1, 'extra': True}) == {'radius': 1}
+
+
+def test_ambiguous_match_falls_back_to_validation():
+    field = StructuralPolyField(candidates=[PositiveCircleSchema, NegativeCircleSchema])
+    assert field.deserialize({'r': 1}) == {'radius': 1}
+    assert field.deserialize({'r': -1}) == {'radius': -1}
+
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize({'r': 0})
+    assert excinfo.value.messages == [
+        "The keys ['r'] match several schemas: PositiveCircleSchema, NegativeCircleSchema."
+    ]
+
+
+def test_ambiguous_when_several_validate():
+    field = StructuralPolyField(candidates=[CircleSchema, LooseCircleSchema])
+    with pytest.raises(ValidationError) as excinfo:
+        field.deserialize({'r': 1})
+    assert excinfo.value.messages == [
+        "The keys ['r'] match several schemas: CircleSchema, LooseCircleSchema."
+    ]
+
+
+def test_partial_load_needs_no_required_keys():
+    field = StructuralPolyField(candidates=[CircleSchema, PositiveCircleSchema])
+    with pytest.raises(ValidationError):
+        field.deserialize({'color': 'red'})
+    assert field.deserialize({'color': 'red'}, partial=True) == {'color': 'red'}
+
+    class DrawingSchema(Schema):
+        shape = StructuralPolyField(candidates=[CircleSchema, PositiveCircleSchema])
+
+    assert DrawingSchema().load({'shape': {'color': 'red'}}, partial=True) == {
+        'shape': {'color': 'red'}
+    }
+    with pytest.raises(ValidationError) as excinfo:
+        DrawingSchema().load({'shape': {'r': 1}}, partial=True)
+    assert excinfo.value.messages == {'shape': [
+        "The keys ['r'] match several schemas: CircleSchema, PositiveCircleSchema."
+    ]}
+
+
+def test_serialize():
+    assert make_field().serialize('shape', {'shape': Triangle('red', 1, 2)}) == {
+        'color': 'red', 'base': 1, 'height': 2
+    }
+    field = StructuralPolyField(candidates=[TriangleSchema])
+    with pytest.raises(TypeError):
+        field.serialize('shape', {'shape': Triangle('red', 1, 2)})
+
+
+def test_candidates_must_be_schemas():
+    with pytest.raises(ValueError):
+        StructuralPolyField(candidates=[fields.Str])
+
+
+def test_openapi():
+    assert make_field().openapi_schema() == {
+        'oneOf': [
+            {'$ref': '#/components/schemas/TriangleSchema'},
+            {'$ref': '#/components/schemas/RectangleSchema'},
+            {'$ref': '#/components/schemas/CircleSchema'},
+        ]
+    }
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from marshmallow import Schema, fields, post_load
+
+from marshmallow_polyfield import PolyField
+
+
+class RequestSchema(Schema):
+    name = fields.Str()
+
+    @post_load
+    def add_request(self, data, **_):
+        data['request'] = self.context['request']
+        return data
+
+
+class RequestDumpSchema(Schema):
+    request = fields.Method('get_request')
+
+    def get_request(self, obj):
+        return self.context['request']
+
+
+def make_parent_schema(thread_local_cache=True):
+    class ParentSchema(Schema):
+        items = PolyField(
+            deserialization_schema_selector=lambda _, __: RequestSchema,
+            serialization_schema_selector=lambda _, __: RequestDumpSchema,
+            many=True,
+            thread_local_cache=thread_local_cache,
+        )
+    return ParentSchema
+
+
+def test_thread_local_cache_under_concurrency():
+    parent_schema = make_parent_schema()
+    schema_ids = set()
+    lock = threading.Lock()
+
+    def work(request):
+        schema = parent_schema(context={'request': request})
+        for _ in range(20):
+            loaded = schema.load({'items': [{'name': 'a'}] * 20})
+            assert {item['request'] for item in loaded['items']} == {request}
+            dumped = schema.dump({'items': [{'name': 'a'}] * 20})
+            assert {item['request'] for item in dumped['items']} == {request}
+        field = schema.fields['items']
+        with lock:
+            schema_ids.add(id(field._caches.schemas.get(RequestSchema).schema))
+        return request
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        assert sorted(executor.map(work, range(64))) == list(range(64))
+
+    # Each worker thread built its own instance, no matter how many requests it served
+    assert len(schema_ids) <= 16
+
+
+def test_shared_cache_under_concurrency():
+    parent_schema = make_parent_schema(thread_local_cache=False)
+    schema_ids = set()
+
+    def work(request):
+        schema = parent_schema(context={'request': request})
+        for _ in range(20):
+            loaded = schema.load({'items': [{'name': 'a'}] * 20})
+            assert {item['request'] for item in loaded['items']} == {request}
+            dumped = schema.dump({'items': [{'name': 'a'}] * 20})
+            assert {item['request'] for item in dumped['items']} == {request}
+        schema_ids.add(id(schema.fields['items']._caches.schemas.get(RequestSchema).schema))
+        return request
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        assert sorted(executor.map(work, range(200))) == list(range(200))
+
+    # Every thread used the one shared instance
+    assert len(schema_ids) == 1
+
+
+def test_thread_local_cache_is_per_thread():
+    field = PolyField(deserialization_schema_selector=lambda _, __: RequestSchema,
+                      thread_local_cache=True)
+    field._caches.schemas.put('main', 1)
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append('main' in field._caches.schemas))
+    thread.start()
+    thread.join()
+
+    assert seen == [False]
+    assert 'main' in field._caches.schemas
+
+
+def test_shared_cache_evicting_under_concurrency():
+    schemas = [
+        type('Schema{}'.format(i), (RequestSchema,), {'kind': fields.Int()}) for i in range(8)
+    ]
+
+    class ParentSchema(Schema):
+        items = PolyField(
+            deserialization_schema_selector=lambda value, _: schemas[value['kind']],
+            many=True,
+            schema_cache_size=2,
+        )
+
+    def work(request):
+        schema = ParentSchema(context={'request': request})
+        for _ in range(5):
+            loaded = schema.load({'items': [{'kind': i} for i in range(8)] * 4})
+            assert [item['request'] for item in loaded['items']] == [request] * 32
+        return request
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        assert sorted(executor.map(work, range(32))) == list(range(32))
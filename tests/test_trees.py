@@ -0,0 +1,109 @@
+import sys
+
+from marshmallow import Schema, ValidationError, pre_load
+import pytest
+
+from marshmallow_polyfield import PolyField
+from tests.trees import Group, Leaf, balanced_tree, chain, make_tree_schemas
+
+
+@pytest.fixture(params=[False, True], ids=['recursive', 'iterative'])
+def group_schema(request):
+    return make_tree_schemas(iterative=request.param)[0]()
+
+
+def test_load_tree(group_schema):
+    data = {
+        'children': [
+            {'value': 1},
+            {'children': [{'value': 2}], 'note': {'type': 'leaf', 'value': 3}},
+        ],
+    }
+    assert group_schema.load(data) == Group([
+        Leaf(1),
+        Group([Leaf(2)], note=Leaf(3)),
+    ])
+
+
+def test_tree_errors_follow_the_path():
+    group_schema = make_tree_schemas(iterative=True)[0]()
+    data = {
+        'children': [
+            {'value': 1},
+            {'children': [{'value': 'two'}]},
+        ],
+    }
+    with pytest.raises(ValidationError) as excinfo:
+        group_schema.load(data)
+    # The outer list raises the error of its failing element as is
+    assert excinfo.value.messages == {
+        'children': {'children': {0: {'value': ['Not a valid integer.']}}}
+    }
+
+    with pytest.raises(ValidationError) as excinfo:
+        group_schema.load({'children': [], 'note': {'type': 'branch'}})
+    assert excinfo.value.messages == {
+        'note': ['Unknown value for discriminator "type": \'branch\'.']
+    }
+
+
+def test_children_rejected_by_the_field():
+    group_schema = make_tree_schemas(iterative=True)[0]()
+    with pytest.raises(ValidationError) as excinfo:
+        group_schema.load({'children': [{'children': 'leaves'}]})
+    assert excinfo.value.messages == {
+        'children': {'children': {'_schema': ['Invalid input type.']}}
+    }
+
+
+def test_deep_tree_does_not_recurse():
+    group_schema, _ = make_tree_schemas(iterative=True)
+    depth = sys.getrecursionlimit() * 2
+    tree = group_schema().load(chain(depth))
+
+    for _ in range(depth):
+        tree, = tree.children
+    assert tree == Leaf(0)
+
+
+def test_balanced_tree(group_schema):
+    tree = group_schema.load(balanced_tree(1000))
+    leaves = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Group):
+            stack.extend(node.children)
+        else:
+            leaves += 1
+    assert leaves == 900
+
+
+def test_pre_load_schemas_load_their_children():
+    _, leaf_schema = make_tree_schemas()
+
+    class ShorthandSchema(Schema):
+        children = PolyField(
+            deserialization_schema_selector=lambda value, _: (
+                ShorthandSchema if 'children' in value else leaf_schema
+            ),
+            many=True,
+            iterative=True
+        )
+
+        @pre_load
+        def expand(self, data, **_):
+            return {'children': [
+                {'value': child} if isinstance(child, int) else child
+                for child in data['children']
+            ]}
+
+    data = {'children': [{'children': [1, {'children': [2]}]}]}
+    assert ShorthandSchema().load(data) == {
+        'children': [{'children': [Leaf(1), {'children': [Leaf(2)]}]}]
+    }
+
+
+def test_iterative_rejects_batch():
+    with pytest.raises(ValueError):
+        make_tree_schemas(iterative=True, batch=True)
@@ -0,0 +1,66 @@
+import gc
+
+from marshmallow import Schema, fields
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField, warm_up
+from tests.shapes import (
+    RectangleSchema,
+    TriangleSchema,
+    shape_schema_deserialization_disambiguation,
+)
+
+
+def make_field(**kwargs):
+    return PolyField(
+        deserialization_schema_selector=shape_schema_deserialization_disambiguation,
+        candidate_schemas=[TriangleSchema, RectangleSchema],
+        **kwargs
+    )
+
+
+class InnerSchema(Schema):
+    shape = make_field()
+
+
+class DrawingSchema(Schema):
+    inner = fields.Nested(InnerSchema)
+    layers = fields.List(fields.Nested(InnerSchema))
+    named = fields.Dict(keys=fields.Str(), values=fields.Nested(InnerSchema))
+    pair = fields.Tuple((fields.Int(), fields.Nested(InnerSchema)))
+    children = fields.List(fields.Nested('tests.test_warmup.DrawingSchema'))
+    tagged = DiscriminatedPolyField(mapping={'inner': InnerSchema})
+
+
+def test_field_warm_up():
+    field = make_field()
+    field._caches.schemas.clear()
+    targets = field.warm_up()
+    assert [type(target) for target in targets] == [TriangleSchema, RectangleSchema]
+    assert list(field._caches.schemas) == [TriangleSchema, RectangleSchema]
+
+    field = DiscriminatedPolyField(mapping={'triangle': TriangleSchema})
+    assert [type(target) for target in field.warm_up()] == [TriangleSchema]
+
+
+def test_schema_warm_up():
+    shape = InnerSchema._declared_fields['shape']
+    shape._caches.schemas.clear()
+
+    schema = warm_up(DrawingSchema)
+    assert isinstance(schema, DrawingSchema)
+    assert list(shape._caches.schemas) == [TriangleSchema, RectangleSchema]
+    assert schema.load({'layers': [{'shape': {'color': 'red', 'base': 1, 'height': 2}}]})
+
+
+def test_warm_up_freeze(monkeypatch):
+    frozen = []
+    monkeypatch.setattr(gc, 'freeze', lambda: frozen.append(True))
+    schema = InnerSchema()
+    assert warm_up(schema, freeze=True) is schema
+    assert frozen == [True]
+
+
+def test_warm_up_freeze_without_gc_freeze(monkeypatch):
+    monkeypatch.delattr(gc, 'freeze', raising=False)
+    schema = InnerSchema()
+    assert warm_up(schema, freeze=True) is schema
@@ -0,0 +1,66 @@
+from marshmallow import Schema, fields, post_load
+
+from marshmallow_polyfield import DiscriminatedPolyField, PolyField
+
+
+class Leaf(object):
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+
+class Group(Leaf):
+    def __init__(self, children, note=None):
+        self.children = children
+        self.note = note
+
+
+def make_tree_schemas(**kwargs):
+    """
+    Returns a (GroupSchema, LeafSchema) pair for trees of groups and
+    leaves. Groups hold a PolyField of their children and a tagged note,
+    both built with kwargs
+    """
+    class LeafSchema(Schema):
+        value = fields.Int(required=True)
+
+        @post_load
+        def make_object(self, data, **_):
+            return Leaf(**data)
+
+    class GroupSchema(Schema):
+        children = PolyField(
+            deserialization_schema_selector=lambda value, _: (
+                GroupSchema if 'children' in value else LeafSchema
+            ),
+            many=True,
+            **kwargs
+        )
+        note = DiscriminatedPolyField(mapping={'leaf': LeafSchema}, **kwargs)
+
+        @post_load
+        def make_object(self, data, **_):
+            return Group(**data)
+
+    return GroupSchema, LeafSchema
+
+
+def balanced_tree(nodes, branching=10):
+    """Raw group with at least nodes nodes, each group holding branching children"""
+    leaves = [{'value': i} for i in range(nodes - nodes // branching)]
+    level = leaves
+    while len(level) > 1:
+        level = [
+            {'children': level[i:i + branching]} for i in range(0, len(level), branching)
+        ]
+    return level[0]
+
+
+def chain(depth):
+    """Raw group nested depth levels deep"""
+    node = {'value': 0}
+    for _ in range(depth):
+        node = {'children': [node]}
+    return node